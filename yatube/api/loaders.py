@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+
+from posts.models import Follow, Group, Post
+
+from .serializers import POST_FIELDS, columns, serialize
+
+User = get_user_model()
+
+
+class BatchLoader:
+    """Копит ключи и загружает их все одним запросом.
+
+    ``load`` только запоминает ключ и возвращает функцию, которая после
+    ``dispatch`` вернёт значение (или ``None``, если объекта нет).
+    Уже загруженные ключи повторно не запрашиваются.
+    """
+
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self.pending = set()
+        self.loaded = {}
+
+    def load(self, key):
+        if key not in self.loaded:
+            self.pending.add(key)
+        return lambda: self.loaded.get(key)
+
+    def load_many(self, keys):
+        thunks = [(key, self.load(key)) for key in keys]
+        return lambda: {key: thunk() for key, thunk in thunks}
+
+    def dispatch(self):
+        if not self.pending:
+            return False
+        keys, self.pending = self.pending, set()
+        found = self.fetch(keys)
+        self.loaded.update({key: found.get(key) for key in keys})
+        return True
+
+
+def fetch_posts(ids):
+    rows = (
+        Post.objects.filter(id__in=ids)
+        .annotate(comments_count=Count('comments'))
+        .values(*columns(POST_FIELDS, POST_FIELDS), 'comments_count')
+    )
+    return {
+        row['id']: {
+            **serialize(row, POST_FIELDS, POST_FIELDS),
+            'comments_count': row['comments_count'],
+        }
+        for row in rows
+    }
+
+
+def fetch_users(usernames):
+    rows = (
+        User.objects.filter(username__in=usernames)
+        .annotate(posts_count=Count('posts'))
+        .values('username', 'first_name', 'last_name', 'posts_count')
+    )
+    return {row['username']: row for row in rows}
+
+
+def fetch_groups(slugs):
+    rows = Group.objects.filter(slug__in=slugs).values(
+        'slug', 'title', 'description'
+    )
+    return {row['slug']: row for row in rows}
+
+
+def follow_fetcher(user):
+    def fetch_follows(usernames):
+        if not user.is_authenticated:
+            return {username: False for username in usernames}
+        followed = set(
+            Follow.objects.filter(
+                user=user, author__username__in=usernames
+            ).values_list('author__username', flat=True)
+        )
+        return {username: username in followed for username in usernames}
+    return fetch_follows
+
+
+class Loaders:
+    """Набор загрузчиков, живущий в пределах одного запроса."""
+
+    def __init__(self, user):
+        self.posts = BatchLoader(fetch_posts)
+        self.users = BatchLoader(fetch_users)
+        self.groups = BatchLoader(fetch_groups)
+        self.follows = BatchLoader(follow_fetcher(user))
+
+    def dispatch(self):
+        """Загружает всё накопленное; по запросу на тип за раз."""
+        for loader in (self.posts, self.users, self.groups, self.follows):
+            loader.dispatch()
+
+
+def get_loaders(request):
+    if not hasattr(request, '_loaders'):
+        request._loaders = Loaders(request.user)
+    return request._loaders
@@ -0,0 +1,60 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from posts.models import Post
+
+
+def requests_per_second(client, url, duration):
+    done = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        cache.clear()
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f'{url} returned {response.status_code}')
+        done += 1
+    return done / (time.perf_counter() - started), len(response.content)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает число запросов в секунду у HTML-страниц '
+            'и соответствующих JSON-ресурсов на текущей базе.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=3.0)
+
+    def resource_pairs(self):
+        post = Post.objects.select_related('author', 'group').exclude(
+            group=None
+        ).first()
+        if post is None:
+            raise CommandError('Нужен хотя бы один пост с группой.')
+        username = post.author.username
+        slug = post.group.slug
+        return (
+            (reverse('posts:index'), reverse('api:post_index')),
+            (reverse('posts:group_list', args=[slug]),
+             reverse('api:group_posts', args=[slug])),
+            (reverse('posts:profile', args=[username]),
+             reverse('api:profile_posts', args=[username])),
+            (reverse('posts:post_detail', args=[post.id]),
+             reverse('api:post_detail', args=[post.id])),
+        )
+
+    def handle(self, *args, **options):
+        client = Client()
+        for html_url, api_url in self.resource_pairs():
+            html_rps, html_size = requests_per_second(
+                client, html_url, options['duration']
+            )
+            api_rps, api_size = requests_per_second(
+                client, api_url, options['duration']
+            )
+            self.stdout.write(
+                f'{html_url}: HTML {html_rps:.0f} req/s ({html_size} B), '
+                f'{api_url}: JSON {api_rps:.0f} req/s ({api_size} B)'
+            )
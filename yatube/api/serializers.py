@@ -0,0 +1,47 @@
+from django.core.files.storage import default_storage
+
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'author': 'author__username',
+    'group': 'group__slug',
+    'created': 'created',
+    'image': 'image',
+}
+COMMENT_FIELDS = {
+    'id': 'id',
+    'author': 'author__username',
+    'text': 'text',
+    'created': 'created',
+}
+CURSOR_COLUMNS = {'id', 'created'}
+
+
+def parse_fields(raw, available):
+    """Список полей из ``?fields=``, по умолчанию — все.
+
+    Неизвестное поле вызывает ValueError.
+    """
+    if not raw:
+        return list(available)
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in available]
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+    return fields
+
+
+def columns(fields, available):
+    """Колонки для ``values()`` с учётом полей курсора."""
+    return {available[field] for field in fields} | CURSOR_COLUMNS
+
+
+def _value(field, value):
+    if field == 'image':
+        return default_storage.url(value) if value else None
+    return value
+
+
+def serialize(row, fields, available):
+    """Словарь для ответа из строки ``values()`` без создания модели."""
+    return {field: _value(field, row[available[field]]) for field in fields}
@@ -0,0 +1,172 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='auth', first_name='Имя', last_name='Фамилия'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(15):
+            Post.objects.create(
+                author=cls.author,
+                group=cls.group if i % 2 else None,
+                text=f'Пост {i}',
+            )
+        cls.post = Post.objects.first()
+        Comment.objects.create(
+            post=cls.post, author=cls.author, text='Комментарий'
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_post_list_cursor_pagination(self):
+        """Лента постов проходится курсором без повторов."""
+        url = reverse('api:post_index')
+        texts = []
+        params = {'limit': 4}
+        while True:
+            data = self.guest_client.get(url, params).json()
+            texts += [post['text'] for post in data['results']]
+            if not data['next']:
+                break
+            params['cursor'] = data['next']
+        self.assertEqual(texts, [f'Пост {i}' for i in reversed(range(15))])
+
+    def test_post_fields(self):
+        """Пост сериализуется с автором, группой и датой."""
+        data = self.guest_client.get(reverse('api:post_index')).json()
+        post = data['results'][1]
+        self.assertEqual(
+            set(post), {'id', 'text', 'author', 'group', 'created', 'image'}
+        )
+        self.assertEqual(post['author'], 'auth')
+        self.assertEqual(post['group'], 'test-slug')
+        self.assertIsNone(post['image'])
+
+    def test_field_selection(self):
+        """Параметр fields ограничивает набор полей."""
+        data = self.guest_client.get(
+            reverse('api:post_index'), {'fields': 'id,author'}
+        ).json()
+        self.assertEqual(set(data['results'][0]), {'id', 'author'})
+        response = self.guest_client.get(
+            reverse('api:post_index'), {'fields': 'id,password'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_group_and_profile(self):
+        """Посты группы и профиль автора."""
+        data = self.guest_client.get(
+            reverse('api:group_posts', kwargs={'slug': 'test-slug'})
+        ).json()
+        self.assertEqual(len(data['results']), 7)
+        data = self.guest_client.get(
+            reverse('api:profile', kwargs={'username': 'auth'})
+        ).json()
+        self.assertEqual(data, {
+            'username': 'auth',
+            'first_name': 'Имя',
+            'last_name': 'Фамилия',
+            'posts_count': 15,
+        })
+        response = self.guest_client.get(
+            reverse('api:profile_posts', kwargs={'username': 'nobody'})
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_post_detail_with_comments(self):
+        """Пост отдаётся вместе с комментариями."""
+        data = self.guest_client.get(
+            reverse('api:post_detail', kwargs={'post_id': self.post.id})
+        ).json()
+        self.assertEqual(data['text'], self.post.text)
+        self.assertEqual(data['comments'][0]['text'], 'Комментарий')
+
+    def test_etag(self):
+        """Повтор запроса с ETag возвращает 304."""
+        url = reverse('api:post_index')
+        etag = self.guest_client.get(url)['ETag']
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_read_only(self):
+        """API доступно только на чтение."""
+        response = self.guest_client.post(reverse('api:post_index'))
+        self.assertEqual(response.status_code, HTTPStatus.METHOD_NOT_ALLOWED)
+
+
+class BatchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author, group=cls.group, text='Пост с группой'
+        )
+        cls.post_2 = Post.objects.create(author=cls.other, text='Пост')
+        Comment.objects.create(post=cls.post, author=cls.other, text='Да')
+        cls.reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.reader)
+
+    def test_batch_resolves_each_type_once(self):
+        """Каждый тип ресурсов загружается одним запросом."""
+        params = {
+            'posts': f'{self.post.id},{self.post_2.id},999',
+            'users': 'auth,nobody',
+            'follows': 'auth,other',
+        }
+        with self.assertNumQueries(6):
+            # сессия, пользователь, посты, подписки, авторы, группы
+            response = self.authorized_client.get(
+                reverse('api:batch'), params
+            )
+        data = response.json()
+        post = data['posts'][str(self.post.id)]
+        self.assertEqual(post['comments_count'], 1)
+        self.assertIsNone(data['posts']['999'])
+        self.assertEqual(set(data['users']), {'auth', 'other', 'nobody'})
+        self.assertIsNone(data['users']['nobody'])
+        self.assertEqual(data['users']['auth']['posts_count'], 1)
+        self.assertEqual(data['groups']['test-slug']['title'],
+                         'Тестовая группа')
+        self.assertEqual(data['follows'], {'auth': True, 'other': False})
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_batch_guest_follows(self):
+        """Гость ни на кого не подписан, запрос подписок не нужен."""
+        with self.assertNumQueries(0):
+            response = Client().get(reverse('api:batch'), {'follows': 'auth'})
+        self.assertEqual(response.json()['follows'], {'auth': False})
+
+    def test_batch_invalid_ids(self):
+        """Неверные идентификаторы возвращают 400."""
+        response = self.authorized_client.get(
+            reverse('api:batch'), {'posts': 'abc'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
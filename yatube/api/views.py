@@ -0,0 +1,164 @@
+import hashlib
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_GET
+
+from core.paginator import decode_cursor, keyset_page
+from posts.models import Comment, Group, Post
+
+from .loaders import get_loaders
+from .serializers import (COMMENT_FIELDS, POST_FIELDS, columns, parse_fields,
+                          serialize)
+
+User = get_user_model()
+
+DEFAULT_LIMIT: int = 10
+MAX_BATCH_KEYS: int = 100
+MAX_LIMIT: int = 100
+API_CACHE_TIMEOUT: int = 20
+
+
+def error_response(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def json_response(request, data, private=False):
+    """Компактный JSON с ETag по содержимому и ответом 304."""
+    content = json.dumps(
+        data, cls=DjangoJSONEncoder, ensure_ascii=False,
+        separators=(',', ':')
+    ).encode()
+    etag = f'"{hashlib.md5(content).hexdigest()}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    visibility = {'private': True} if private else {'public': True}
+    patch_cache_control(response, max_age=API_CACHE_TIMEOUT, **visibility)
+    return response
+
+
+def _limit(request):
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError('limit must be an integer') from None
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def post_list_response(request, posts):
+    """Страница постов по курсору: ``results`` и курсор ``next``."""
+    try:
+        fields = parse_fields(request.GET.get('fields'), POST_FIELDS)
+        cursor = decode_cursor(request.GET.get('cursor'))
+        limit = _limit(request)
+    except ValueError as error:
+        return error_response(str(error))
+    rows = posts.values(*columns(fields, POST_FIELDS))
+    page, next_cursor = keyset_page(rows, cursor, limit)
+    return json_response(request, {
+        'results': [serialize(row, fields, POST_FIELDS) for row in page],
+        'next': next_cursor,
+    })
+
+
+@require_GET
+def post_index(request):
+    return post_list_response(request, Post.objects.all())
+
+
+@require_GET
+def group_posts(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    return post_list_response(request, group.group.all())
+
+
+@require_GET
+def profile(request, username):
+    author = get_object_or_404(
+        User.objects.values('username', 'first_name', 'last_name'),
+        username=username
+    )
+    author['posts_count'] = Post.objects.filter(
+        author__username=username
+    ).count()
+    return json_response(request, author)
+
+
+@require_GET
+def profile_posts(request, username):
+    author = get_object_or_404(User, username=username)
+    return post_list_response(request, author.posts.all())
+
+
+@require_GET
+def post_detail(request, post_id):
+    try:
+        fields = parse_fields(request.GET.get('fields'), POST_FIELDS)
+    except ValueError as error:
+        return error_response(str(error))
+    row = get_object_or_404(
+        Post.objects.values(*columns(fields, POST_FIELDS)), id=post_id
+    )
+    data = serialize(row, fields, POST_FIELDS)
+    comments = Comment.objects.filter(post_id=post_id).values(
+        *COMMENT_FIELDS.values()
+    )
+    data['comments'] = [
+        serialize(comment, COMMENT_FIELDS, COMMENT_FIELDS)
+        for comment in comments
+    ]
+    return json_response(request, data)
+
+
+def _batch_keys(request, name, convert=str):
+    keys = [key for key in request.GET.get(name, '').split(',') if key]
+    if len(keys) > MAX_BATCH_KEYS:
+        raise ValueError(f'Too many {name}: max {MAX_BATCH_KEYS}')
+    try:
+        return [convert(key) for key in keys]
+    except ValueError:
+        raise ValueError(f'Invalid {name}') from None
+
+
+@require_GET
+def batch(request):
+    """Несколько ресурсов за один запрос.
+
+    ``?posts=1,2&users=a,b&groups=slug&follows=a`` — каждый тип
+    загружается одним запросом ``IN``; авторы и группы запрошенных
+    постов добавляются к ответу следующей волной загрузки.
+    """
+    try:
+        post_ids = _batch_keys(request, 'posts', int)
+        usernames = _batch_keys(request, 'users')
+        slugs = _batch_keys(request, 'groups')
+        follows = _batch_keys(request, 'follows')
+    except ValueError as error:
+        return error_response(str(error))
+    loaders = get_loaders(request)
+    posts = loaders.posts.load_many(post_ids)
+    loaders.follows.load_many(follows)
+    loaders.dispatch()
+    for post in posts().values():
+        if post is not None:
+            usernames.append(post['author'])
+            if post['group']:
+                slugs.append(post['group'])
+    users = loaders.users.load_many(usernames)
+    groups = loaders.groups.load_many(slugs)
+    loaders.dispatch()
+    data = {
+        'posts': posts(),
+        'users': users(),
+        'groups': groups(),
+        'follows': loaders.follows.load_many(follows)(),
+    }
+    return json_response(
+        request, data, private=request.user.is_authenticated
+    )
@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import ConsumerOffset, Event, Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'status', 'attempts', 'run_at',
+                    'last_error')
+    list_filter = ('status', 'name')
+    empty_value_display = '-пусто-'
+
+
+class EventAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'created', 'topic', 'action', 'object_id')
+    list_filter = ('topic', 'action')
+
+
+class ConsumerOffsetAdmin(admin.ModelAdmin):
+    list_display = ('name', 'offset')
+
+
+admin.site.register(Task, TaskAdmin)
+admin.site.register(Event, EventAdmin)
+admin.site.register(ConsumerOffset, ConsumerOffsetAdmin)
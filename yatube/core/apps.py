@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        # задача отправки писем для runworker и запись удалений в outbox
+        from . import mail  # noqa: F401
+        from .outbox import connect_deletes
+        connect_deletes()
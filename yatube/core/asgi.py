@@ -0,0 +1,109 @@
+import asyncio
+from tempfile import SpooledTemporaryFile
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+
+MAX_BUFFERED_BODY: int = 65536
+# сколько кусков ответа ждут медленного клиента, прежде чем поток
+# представления остановится; у FileResponse кусок — 8 КБ
+MAX_QUEUED_CHUNKS: int = 16
+
+
+class PooledWsgiToAsgiInstance(WsgiToAsgiInstance):
+    """Запрос к WSGI-приложению в потоке из пула.
+
+    asgiref запускает WSGI-приложение через sync_to_async с
+    thread_sensitive=True, то есть все запросы идут по очереди в одном
+    потоке, и этот поток ждёт, пока клиент примет каждый кусок ответа.
+    Здесь приложение работает в общем пуле потоков, а куски ответа
+    складываются в очередь, которую отдаёт клиенту цикл событий:
+    обычная страница — один кусок, и поток освобождается сразу, даже
+    если клиент медленный. Очередь ограничена MAX_QUEUED_CHUNKS, так что
+    файлы и потоковые ответы не копятся в памяти: когда она полна,
+    поток ждёт клиента, как в asgiref.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            raise ValueError('WSGI wrapper received a non-HTTP scope')
+        self.scope = scope
+        with SpooledTemporaryFile(max_size=MAX_BUFFERED_BODY) as body:
+            while True:
+                message = await receive()
+                if message['type'] != 'http.request':
+                    raise ValueError(
+                        'WSGI wrapper received a non-HTTP-request message'
+                    )
+                body.write(message.get('body', b''))
+                if not message.get('more_body'):
+                    break
+            body.seek(0)
+            loop = asyncio.get_running_loop()
+            queue = asyncio.Queue(MAX_QUEUED_CHUNKS)
+            self.sync_send = lambda message: asyncio.run_coroutine_threadsafe(
+                queue.put(message), loop
+            ).result()
+            sender = asyncio.ensure_future(self.drain(queue, send))
+            try:
+                await sync_to_async(
+                    self.run_app, thread_sensitive=False
+                )(body)
+            finally:
+                await queue.put(None)
+                await sender
+
+    async def drain(self, queue, send):
+        """Отдаёт куски клиенту; после ошибки только освобождает очередь.
+
+        Иначе поток представления навсегда застрял бы на полной очереди.
+        """
+        error = None
+        while True:
+            message = await queue.get()
+            if message is None:
+                break
+            if error is None:
+                try:
+                    await send(message)
+                except Exception as exc:
+                    error = exc
+        if error is not None:
+            raise error
+
+    def run_app(self, body):
+        """То же, что WsgiToAsgiInstance.run_wsgi_app, но без ожидания send."""
+        environ = self.build_environ(self.scope, body)
+        bytes_sent = 0
+        response = self.wsgi_application(environ, self.start_response)
+        try:
+            for output in response:
+                if not self.response_started:
+                    self.response_started = True
+                    self.sync_send(self.response_start)
+                if self.response_content_length is not None:
+                    output = output[:self.response_content_length - bytes_sent]
+                self.sync_send({
+                    'type': 'http.response.body',
+                    'body': output,
+                    'more_body': True,
+                })
+                bytes_sent += len(output)
+                if bytes_sent == self.response_content_length:
+                    break
+        finally:
+            if hasattr(response, 'close'):
+                response.close()
+        if not self.response_started:
+            self.response_started = True
+            self.sync_send(self.response_start)
+        self.sync_send({'type': 'http.response.body'})
+
+
+class PooledWsgiToAsgi(WsgiToAsgi):
+    """WsgiToAsgi, не сводящий все запросы в один поток."""
+
+    async def __call__(self, scope, receive, send):
+        await PooledWsgiToAsgiInstance(self.wsgi_application)(
+            scope, receive, send
+        )
@@ -0,0 +1,218 @@
+import hashlib
+import threading
+import time
+import uuid
+from functools import wraps
+from importlib import import_module
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection, transaction
+from django.utils.cache import (get_cache_key, learn_cache_key,
+                                patch_cache_control, patch_response_headers)
+
+SWR_LOCK_TIMEOUT = 10
+SWR_WAIT_INTERVAL = 0.05
+PERSONAL_VERSION_KEY = 'swr_personal_version:{}'
+
+
+def _lock_key(request, key_prefix):
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'swr_lock:{key_prefix}:{url}'
+
+
+def _is_personal(request):
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_authenticated
+
+
+def personal_version(request):
+    """Версия личных записей пользователя или None для гостя."""
+    if not _is_personal(request):
+        return None
+    return cache.get(PERSONAL_VERSION_KEY.format(request.user.pk), '')
+
+
+def invalidate_personal_pages(user_id):
+    """Сбрасывает страницы пользователя сразу и ещё раз после коммита.
+
+    Новая версия меняет ключи его записей (см. variant_prefix), старые
+    просто истекают. Второй сброс убирает страницу, которую параллельный
+    запрос успел закешировать до коммита.
+    """
+    def bump():
+        cache.set(PERSONAL_VERSION_KEY.format(user_id), uuid.uuid4().hex, None)
+    bump()
+    transaction.on_commit(bump)
+
+
+def variant_prefix(request, key_prefix, version=None):
+    """Префикс ключа: общий для гостей, свой у каждого пользователя.
+
+    Страница вошедшего пользователя содержит его имя, реакции и
+    CSRF-токен, поэтому в ключ входят id пользователя, версия его
+    записей и токен. Токен берётся из META: до представления там кука
+    запроса, после — токен, который попал в страницу и уйдёт в куке
+    ответа. Версию пересчёт читает до представления, чтобы сброс во
+    время его работы не достался устаревшей странице.
+    """
+    if not _is_personal(request):
+        return key_prefix
+    if version is None:
+        version = personal_version(request)
+    token = request.META.get('CSRF_COOKIE', '')
+    token_hash = hashlib.md5(token.encode()).hexdigest()
+    return f'{key_prefix}:user{request.user.pk}:{version}:{token_hash}'
+
+
+def _is_cacheable(request, response):
+    if response.streaming or response.status_code != 200:
+        return False
+    if 'private' in response.get('Cache-Control', ''):
+        return False
+    # Vary: Cookie сюда ещё не дошёл (его ставят middleware позже),
+    # поэтому смотрим на сам запрос: общая страница не должна
+    # содержать CSRF-токен посетителя
+    return _is_personal(request) or not request.META.get('CSRF_COOKIE_USED')
+
+
+def anonymous_request(request):
+    """Новый анонимный запрос к тому же адресу для фонового пересчёта.
+
+    Исходный запрос уже отдан своему потоку, а содержимое общей
+    страницы не должно зависеть от того, чей запрос его обновил.
+    """
+    fresh = WSGIRequest({
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': request.META.get('SCRIPT_NAME', ''),
+        'PATH_INFO': request.path_info,
+        'QUERY_STRING': request.META.get('QUERY_STRING', ''),
+        'HTTP_HOST': request.get_host(),
+        'SERVER_NAME': request.META.get('SERVER_NAME', 'localhost'),
+        'SERVER_PORT': request.META.get('SERVER_PORT', '80'),
+        'wsgi.url_scheme': request.scheme,
+        'wsgi.input': BytesIO(),
+    })
+    fresh.user = AnonymousUser()
+    fresh.session = import_module(settings.SESSION_ENGINE).SessionStore()
+    return fresh
+
+
+def start_refresh(refresh):
+    """Запускает обновление записи в фоновом потоке."""
+    def run():
+        try:
+            refresh()
+        finally:
+            connection.close()
+    threading.Thread(target=run, daemon=True).start()
+
+
+class StaleWhileRevalidate:
+    """Кеширование ответов представления с единственным пересчётом."""
+
+    def __init__(self, view_func, timeout, stale_timeout, refresh_ahead,
+                 key_prefix):
+        self.view_func = view_func
+        self.timeout = timeout
+        self.stale_timeout = stale_timeout
+        self.refresh_ahead = refresh_ahead
+        self.key_prefix = key_prefix
+
+    def __call__(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return self.view_func(request, *args, **kwargs)
+        key_prefix = variant_prefix(request, self.key_prefix)
+        entry = self.cached_entry(request, key_prefix)
+        if entry is None:
+            return self.compute_cold(request, args, kwargs, key_prefix)
+        response, fresh_until = entry
+        now = time.time()
+        if now < fresh_until - self.refresh_ahead:
+            return response
+        if _is_personal(request):
+            # личную запись читает только её владелец: пересчёт сразу
+            if now < fresh_until:
+                return response
+            return self.compute(request, args, kwargs)
+        lock_key = _lock_key(request, key_prefix)
+        if not cache.add(lock_key, 1, SWR_LOCK_TIMEOUT):
+            return response
+        if now < fresh_until:
+            fresh = anonymous_request(request)
+            start_refresh(
+                lambda: self.compute_locked(fresh, args, kwargs, lock_key)
+            )
+            return response
+        return self.compute_locked(request, args, kwargs, lock_key)
+
+    def cached_entry(self, request, key_prefix):
+        key = get_cache_key(request, key_prefix, 'GET', cache)
+        return cache.get(key) if key else None
+
+    def compute(self, request, args, kwargs):
+        version = personal_version(request)
+        response = self.view_func(request, *args, **kwargs)
+        if _is_cacheable(request, response):
+            key_prefix = variant_prefix(request, self.key_prefix, version)
+            patch_response_headers(response, self.timeout)
+            if _is_personal(request):
+                patch_cache_control(response, private=True)
+            key = learn_cache_key(request, response, self.timeout,
+                                  key_prefix, cache)
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+            cache.set(key, (response, time.time() + self.timeout),
+                      self.timeout + self.stale_timeout)
+        return response
+
+    def compute_locked(self, request, args, kwargs, lock_key):
+        try:
+            return self.compute(request, args, kwargs)
+        finally:
+            cache.delete(lock_key)
+
+    def compute_cold(self, request, args, kwargs, key_prefix):
+        """Пустой кеш: считает один запрос, остальные ждут его ответ."""
+        lock_key = _lock_key(request, key_prefix)
+        deadline = time.time() + SWR_LOCK_TIMEOUT
+        while not cache.add(lock_key, 1, SWR_LOCK_TIMEOUT):
+            time.sleep(SWR_WAIT_INTERVAL)
+            entry = self.cached_entry(request, key_prefix)
+            if entry is not None:
+                return entry[0]
+            if time.time() > deadline:
+                return self.view_func(request, *args, **kwargs)
+        return self.compute_locked(request, args, kwargs, lock_key)
+
+
+def stale_while_revalidate(timeout, stale_timeout=None, refresh_ahead=None,
+                           key_prefix=''):
+    """Замена cache_page без лавины одинаковых запросов.
+
+    Гости делят одну запись, у вошедшего пользователя она своя
+    (см. variant_prefix). Ответ свеж timeout секунд и ещё stale_timeout
+    секунд хранится устаревшим. Пересчитывает страницу только запрос,
+    взявший короткую блокировку в кеше; остальные тем временем получают
+    устаревший ответ, а при холодном кеше ждут готовый. За refresh_ahead
+    секунд до истечения свежести общая запись обновляется в фоне новым
+    анонимным запросом.
+    """
+    if stale_timeout is None:
+        stale_timeout = timeout * 3
+    if refresh_ahead is None:
+        refresh_ahead = timeout / 4
+
+    def decorator(view_func):
+        cached_view = StaleWhileRevalidate(
+            view_func, timeout, stale_timeout, refresh_ahead, key_prefix
+        )
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            return cached_view(request, *args, **kwargs)
+        return wrapper
+    return decorator
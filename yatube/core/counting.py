@@ -0,0 +1,78 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .paginator import EstimatedCount, WindowedPaginator
+
+EXACT_COUNT_THRESHOLD = getattr(settings, 'EXACT_COUNT_THRESHOLD', 10000)
+COUNT_CACHE_TIMEOUT = getattr(settings, 'COUNT_CACHE_TIMEOUT', 60)
+
+
+def table_row_estimate(model, using='default'):
+    """Оценка числа строк таблицы из статистики планировщика.
+
+    Для SQLite берётся из ``sqlite_stat1`` (заполняется ``ANALYZE``),
+    для PostgreSQL — из ``pg_class.reltuples``.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            )
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute(
+                'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+                [table]
+            )
+            row = cursor.fetchone()
+            return int(row[0].split()[0]) if row else None
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s', [table]
+            )
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] >= 0 else None
+    return None
+
+
+def _count_cache_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(f'{sql}{params}'.encode()).hexdigest()
+    return f'count:{queryset.model._meta.label_lower}:{digest}'
+
+
+def estimated_count(queryset, threshold=None):
+    """Количество объектов в выборке, точное только для небольших.
+
+    Если последний точный подсчёт или статистика таблицы не меньше
+    ``threshold``, возвращается ``EstimatedCount`` без запроса COUNT.
+    Точный подсчёт больших выборок кешируется на COUNT_CACHE_TIMEOUT.
+    """
+    if threshold is None:
+        threshold = EXACT_COUNT_THRESHOLD
+    key = _count_cache_key(queryset)
+    known = cache.get(key)
+    if known is None and not queryset.query.where:
+        known = table_row_estimate(queryset.model, queryset.db)
+    if known is not None and known >= threshold:
+        return EstimatedCount(known)
+    count = queryset.count()
+    if count >= threshold:
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+class EstimatedCountPaginator(WindowedPaginator):
+    """Пагинатор, который считает объекты через ``estimated_count``."""
+
+    @cached_property
+    def count(self):
+        if self._count is not None:
+            return super().count
+        return estimated_count(self.object_list)
@@ -0,0 +1,128 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import Http404
+from django.utils.functional import empty
+from django.db.models.fields.related_descriptors import (
+    ForwardManyToOneDescriptor)
+
+logger = logging.getLogger(__name__)
+
+_current_map = ContextVar('identity_map', default=None)
+
+
+class IdentityMap:
+    """Объекты, уже загруженные в рамках запроса, по модели и pk."""
+
+    def __init__(self, user=None):
+        self.objects = {}
+        self.saved_queries = 0
+        self.user = user
+
+    def get(self, model, pk):
+        obj = self.objects.get((model._meta.concrete_model, pk))
+        if obj is None:
+            obj = self.loaded_user(model, pk)
+        if obj is not None:
+            self.saved_queries += 1
+        return obj
+
+    def loaded_user(self, model, pk):
+        """request.user, если запрос его уже загрузил.
+
+        Сам пользователь не вычисляется: чтение сессии ради карты
+        добавило бы Vary: Cookie всем ответам, включая статику.
+        """
+        user = getattr(self.user, '_wrapped', empty)
+        if user is empty or not user.is_authenticated:
+            return None
+        if user._meta.concrete_model is not model._meta.concrete_model:
+            return None
+        return user if user.pk == pk else None
+
+    def add(self, obj):
+        if obj is not None:
+            self.objects[(obj._meta.concrete_model, obj.pk)] = obj
+        return obj
+
+
+def current_identity_map():
+    return _current_map.get()
+
+
+@contextmanager
+def use_identity_map(user=None):
+    """Включает отдельную карту объектов на время блока."""
+    identity_map = IdentityMap(user)
+    token = _current_map.set(identity_map)
+    try:
+        yield identity_map
+    finally:
+        _current_map.reset(token)
+
+
+def identity_get(model, pk):
+    """Объект по pk: из карты запроса или из базы (и в карту)."""
+    identity_map = current_identity_map()
+    if identity_map is None:
+        return model._default_manager.get(pk=pk)
+    obj = identity_map.get(model, pk)
+    if obj is None:
+        obj = identity_map.add(model._default_manager.get(pk=pk))
+    return obj
+
+
+def identity_get_or_404(model, pk):
+    """identity_get, но отсутствующий объект превращается в 404."""
+    try:
+        return identity_get(model, pk)
+    except model.DoesNotExist:
+        raise Http404(f'{model._meta.object_name} {pk} не найден')
+
+
+class IdentityMapDescriptor(ForwardManyToOneDescriptor):
+    """Ленивая загрузка внешнего ключа через карту объектов запроса."""
+
+    def get_object(self, instance):
+        identity_map = current_identity_map()
+        if identity_map is None or not self.field.target_field.primary_key:
+            return super().get_object(instance)
+        model = self.field.remote_field.model
+        pk = getattr(instance, self.field.attname)
+        obj = identity_map.get(model, pk)
+        if obj is None:
+            obj = identity_map.add(super().get_object(instance))
+        return obj
+
+
+def install_identity_map(model, *field_names):
+    """Подключает карту объектов к внешним ключам модели."""
+    for name in field_names:
+        field = model._meta.get_field(name)
+        setattr(model, name, IdentityMapDescriptor(field))
+
+
+class IdentityMapMiddleware:
+    """Карта объектов на время запроса; в DEBUG сообщает об экономии.
+
+    Уже загруженный request.user тоже отдаётся из карты, поэтому
+    post.author для своих постов не читается из базы повторно.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = getattr(request, 'user', None)
+        with use_identity_map(user) as identity_map:
+            response = self.get_response(request)
+        if identity_map.saved_queries:
+            logger.debug('%s: identity map saved %d queries',
+                         request.path, identity_map.saved_queries)
+            if settings.DEBUG:
+                response['X-Identity-Map-Saved'] = str(
+                    identity_map.saved_queries
+                )
+        return response
@@ -0,0 +1,109 @@
+import base64
+import traceback
+from email import message_from_bytes
+from email.header import decode_header, make_header
+from email.message import Message
+from email.utils import getaddresses
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .tasks import task
+
+
+class QueuedMIMEMessage(Message):
+    """MIME-сообщение из очереди; as_bytes понимает linesep, как у Django."""
+
+    def as_bytes(self, unixfrom=False, linesep='\n'):
+        return super().as_bytes(
+            unixfrom, policy=self.policy.clone(linesep=linesep)
+        )
+
+
+class QueuedEmailMessage(EmailMessage):
+    """Письмо, собранное ещё при постановке в очередь.
+
+    Отправляется готовый MIME, а тема, адреса и текст разобраны из него
+    для бэкендов, которые их читают (locmem в тестах).
+    """
+
+    def __init__(self, raw, from_email, recipients):
+        self.mime = message_from_bytes(raw, _class=QueuedMIMEMessage)
+        body = self.mime
+        while body.is_multipart():
+            body = body.get_payload(0)
+        super().__init__(
+            subject=str(make_header(decode_header(
+                self.mime.get('Subject', '')
+            ))),
+            body=body.get_payload(decode=True).decode(
+                body.get_content_charset() or 'utf-8'
+            ),
+            from_email=from_email,
+            to=[address for _, address
+                in getaddresses(self.mime.get_all('To', []))],
+        )
+        self.queued_recipients = recipients
+
+    def recipients(self):
+        return self.queued_recipients
+
+    def message(self):
+        return self.mime
+
+
+def _dump(message):
+    """Письмо для JSON-данных задачи: готовые байты и адресаты."""
+    return {
+        'message': base64.b64encode(message.message().as_bytes()).decode(),
+        'from_email': message.from_email,
+        'recipients': message.recipients(),
+    }
+
+
+def _load(item):
+    return QueuedEmailMessage(
+        base64.b64decode(item['message']),
+        item['from_email'],
+        item['recipients'],
+    )
+
+
+@task(name='core.mail.deliver', batch=True, max_attempts=5)
+def deliver(items):
+    """Отправляет пачку писем через одно соединение QUEUED_EMAIL_BACKEND.
+
+    Письма уходят по одному, поэтому сбой одного не заставляет
+    повторять уже отправленные: в очередь возвращаются только
+    неотправленные.
+    """
+    failed = {}
+    with get_connection(settings.QUEUED_EMAIL_BACKEND) as connection:
+        for index, item in enumerate(items):
+            try:
+                connection.send_messages([_load(item)])
+            except Exception:
+                failed[index] = traceback.format_exc()
+                # после ошибки соединение могло оборваться; бэкенд
+                # откроет новое на следующем письме
+                connection.close()
+    return failed
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Ставит письма в очередь задач вместо отправки в запросе.
+
+    Обработчик (manage.py runworker) забирает их пачками и отправляет
+    настоящим бэкендом из QUEUED_EMAIL_BACKEND, открывая соединение
+    один раз на пачку.
+    """
+
+    def send_messages(self, email_messages):
+        sent = 0
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            deliver.delay(**_dump(message))
+            sent += 1
+        return sent
@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template import engines
+from django.template.loader import get_template
+
+from core.paginator import WindowedPaginator
+
+FULL_RANGE_TEMPLATE = engines['django'].from_string(
+    '{% for i in page_obj.paginator.page_range %}'
+    '{% if page_obj.number == i %}'
+    '<li class="page-item active"><span class="page-link">{{ i }}</span></li>'
+    '{% else %}'
+    '<li class="page-item"><a class="page-link" href="?page={{ i }}">'
+    '{{ i }}</a></li>'
+    '{% endif %}{% endfor %}'
+)
+
+
+def bench(template, page_obj, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        html = template.render({'page_obj': page_obj})
+    return (time.perf_counter() - started) / repeat, len(html.encode())
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время рендера и размер HTML полного списка страниц '
+            'и оконного пагинатора на больших лентах.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts', type=int, nargs='+', default=[100, 10000, 50000, 500000]
+        )
+        parser.add_argument('--per-page', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        windowed_template = get_template('posts/includes/paginator.html')
+        for num_posts in options['posts']:
+            posts = range(num_posts)
+            full_page = Paginator(posts, options['per_page']).page(2)
+            windowed_page = WindowedPaginator(
+                posts, options['per_page']
+            ).page(2)
+            full_time, full_size = bench(
+                FULL_RANGE_TEMPLATE, full_page, options['repeat']
+            )
+            windowed_time, windowed_size = bench(
+                windowed_template, windowed_page, options['repeat']
+            )
+            self.stdout.write(
+                f'{num_posts} posts: '
+                f'page_range {full_time * 1000:.2f} ms / {full_size} B, '
+                f'window {windowed_time * 1000:.2f} ms / {windowed_size} B'
+            )
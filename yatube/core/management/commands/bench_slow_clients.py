@@ -0,0 +1,86 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+
+
+async def slow_request(url, chunk, delay):
+    """Отправляет запрос и читает ответ мелкими порциями с паузами."""
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, parts.port or 80
+    )
+    request = (
+        f'GET {path} HTTP/1.1\r\n'
+        f'Host: {parts.netloc}\r\n'
+        'Accept-Encoding: identity\r\n'
+        'Connection: close\r\n\r\n'
+    ).encode()
+    started = time.perf_counter()
+    try:
+        for start in range(0, len(request), chunk):
+            writer.write(request[start:start + chunk])
+            await writer.drain()
+            await asyncio.sleep(delay)
+        status_line = await reader.readline()
+        while await reader.read(chunk * 64):
+            await asyncio.sleep(delay)
+    finally:
+        writer.close()
+    status = status_line.split(b' ')[1:2]
+    return status == [b'200'], time.perf_counter() - started
+
+
+async def client(url, requests, chunk, delay, results):
+    for _ in range(requests):
+        try:
+            results.append(await slow_request(url, chunk, delay))
+        except OSError:
+            results.append((False, 0.0))
+
+
+async def run_load(url, clients, requests, chunk, delay):
+    results = []
+    await asyncio.gather(*(
+        client(url, requests, chunk, delay, results) for _ in range(clients)
+    ))
+    return results
+
+
+class Command(BaseCommand):
+    help = ('Нагружает запущенные серверы медленными клиентами и сравнивает '
+            'пропускную способность, например gunicorn (yatube.wsgi) '
+            'и uvicorn (yatube.asgi).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+')
+        parser.add_argument('--clients', type=int, default=200)
+        parser.add_argument('--requests', type=int, default=5)
+        parser.add_argument('--chunk', type=int, default=16)
+        parser.add_argument('--delay', type=float, default=0.02)
+
+    def handle(self, *args, **options):
+        for url in options['urls']:
+            started = time.perf_counter()
+            results = asyncio.run(run_load(
+                url, options['clients'], options['requests'],
+                options['chunk'], options['delay'],
+            ))
+            elapsed = time.perf_counter() - started
+            latencies = sorted(latency for ok, latency in results if ok)
+            succeeded = len(latencies)
+            self.stdout.write(
+                f'{url}: {succeeded}/{len(results)} OK, '
+                f'{succeeded / elapsed:.1f} req/s'
+            )
+            if latencies:
+                p95 = latencies[int(len(latencies) * 0.95) - 1]
+                self.stdout.write(
+                    f'  latency p50 {statistics.median(latencies):.3f}s, '
+                    f'p95 {p95:.3f}s'
+                )
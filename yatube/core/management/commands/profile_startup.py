@@ -0,0 +1,48 @@
+import statistics
+
+from django.core.management.base import BaseCommand
+
+from core.startup import profile_startup, time_by_package
+
+
+class Command(BaseCommand):
+    help = ('Измеряет холодный старт процесса: время импорта модулей, '
+            'AppConfig.ready() и создания WSGI-обработчика.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile', nargs='+', default=[None],
+            help='Профили настроек для сравнения (YATUBE_SETTINGS_PROFILE).'
+        )
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--limit', type=int, default=15)
+
+    def handle(self, *args, **options):
+        for profile in options['profile']:
+            reports = [profile_startup(profile)
+                       for _ in range(options['runs'])]
+            self.stdout.write(f'== профиль {profile or "по умолчанию"}')
+            self.write_report(reports, options['limit'])
+
+    def write_report(self, reports, limit):
+        last = reports[-1]
+        self.stdout.write('Модули (собственное / общее время импорта):')
+        slowest = sorted(last['modules'], key=lambda module: -module[1])
+        for name, self_time, cumulative in slowest[:limit]:
+            self.stdout.write(
+                f'{self_time * 1000:8.1f} {cumulative * 1000:8.1f} мс  {name}'
+            )
+        self.stdout.write('Пакеты (собственное время импорта):')
+        for package, seconds in time_by_package(last['modules'])[:limit]:
+            self.stdout.write(f'{seconds * 1000:8.1f} мс  {package}')
+        self.stdout.write('AppConfig.ready():')
+        for label, seconds in sorted(last['ready'].items(),
+                                     key=lambda item: -item[1]):
+            self.stdout.write(f'{seconds * 1000:8.1f} мс  {label}')
+        for key, title in (('setup', 'import django + django.setup()'),
+                           ('total', 'setup + WSGI-обработчик')):
+            values = [report[key] * 1000 for report in reports]
+            self.stdout.write(
+                f'{title}: медиана {statistics.median(values):.1f} мс, '
+                f'мин. {min(values):.1f} мс ({len(values)} запусков)'
+            )
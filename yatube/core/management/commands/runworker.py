@@ -0,0 +1,37 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import autodiscover_modules
+
+from core.tasks import TASK_BATCH_SIZE, run_tasks
+
+
+class Command(BaseCommand):
+    help = 'Выполняет отложенные задачи из очереди core.Task.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            default=TASK_BATCH_SIZE)
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help='Пауза при пустой очереди, секунды.')
+        parser.add_argument('--once', action='store_true',
+                            help='Разобрать очередь и завершиться.')
+
+    def handle(self, *args, **options):
+        autodiscover_modules('tasks')
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        done = 0
+        try:
+            while True:
+                processed = run_tasks(worker_id, options['batch_size'])
+                done += processed
+                if processed:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f'Обработано задач: {done}')
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import autodiscover_modules
+
+from core.outbox import CONSUMERS, OUTBOX_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = ('Передаёт события outbox зарегистрированным потребителям '
+            '(модули consumers.py приложений).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('consumers', nargs='*',
+                            help='Имена потребителей; по умолчанию все.')
+        parser.add_argument('--batch-size', type=int,
+                            default=OUTBOX_BATCH_SIZE)
+        parser.add_argument('--sleep', type=float, default=1.0)
+        parser.add_argument('--once', action='store_true',
+                            help='Дочитать журнал до конца и завершиться.')
+        parser.add_argument('--replay', action='store_true',
+                            help='Начать с первого события журнала.')
+
+    def handle(self, *args, **options):
+        autodiscover_modules('consumers')
+        names = options['consumers'] or list(CONSUMERS)
+        unknown = set(names) - set(CONSUMERS)
+        if unknown:
+            raise CommandError(f'Нет потребителей: {", ".join(unknown)}')
+        consumers = [CONSUMERS[name] for name in names]
+        if options['replay']:
+            for consumer in consumers:
+                consumer.reset()
+        try:
+            while True:
+                processed = sum(
+                    consumer.poll(options['batch_size'])
+                    for consumer in consumers
+                )
+                if processed:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        for consumer in consumers:
+            self.stdout.write(f'{consumer.name}: смещение {consumer.offset}')
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponseNotFound
+
+FAST_404_COUNTER_KEY = 'fast_404_absorbed'
+
+FAST_404_EXTENSIONS = getattr(settings, 'FAST_404_EXTENSIONS', (
+    '.ico', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.bmp',
+    '.css', '.js', '.map', '.woff', '.woff2', '.ttf', '.eot',
+    '.php', '.asp', '.aspx', '.jsp', '.cgi', '.env', '.bak', '.sql',
+))
+
+FAST_404_PREFIXES = getattr(settings, 'FAST_404_PREFIXES', (
+    '/wp-admin', '/wp-login', '/wp-content', '/wp-includes',
+    '/xmlrpc', '/phpmyadmin', '/pma', '/.git', '/.env', '/cgi-bin',
+    '/vendor/phpunit', '/boaform', '/owa/',
+))
+
+
+def absorbed_404_count():
+    """Количество запросов, отброшенных быстрым 404."""
+    return cache.get(FAST_404_COUNTER_KEY, 0)
+
+
+def _count_absorbed():
+    try:
+        cache.incr(FAST_404_COUNTER_KEY)
+    except ValueError:
+        cache.add(FAST_404_COUNTER_KEY, 0, timeout=None)
+        cache.incr(FAST_404_COUNTER_KEY)
+
+
+class Fast404Middleware:
+    """Отвечает коротким 404 на запросы к файлам и адресам ботов.
+
+    Такие запросы не доходят до сессий, аутентификации, разрешения
+    URL и рендеринга шаблона 404. Адреса внутри STATIC_URL и MEDIA_URL
+    пропускаются дальше как есть.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.passthrough = tuple(
+            prefix for prefix in (settings.STATIC_URL, settings.MEDIA_URL)
+            if prefix
+        )
+
+    def __call__(self, request):
+        if self.is_junk(request.path):
+            _count_absorbed()
+            return HttpResponseNotFound(
+                'Not Found', content_type='text/plain'
+            )
+        return self.get_response(request)
+
+    def is_junk(self, path):
+        lowered = path.lower()
+        if lowered.startswith(FAST_404_PREFIXES):
+            return True
+        if lowered.startswith(self.passthrough):
+            return False
+        return lowered.endswith(FAST_404_EXTENSIONS)
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsumerOffset',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Потребитель')),
+                ('offset', models.PositiveIntegerField(default=0, verbose_name='Смещение')),
+            ],
+            options={
+                'verbose_name': 'Смещение потребителя',
+                'verbose_name_plural': 'Смещения потребителей',
+            },
+        ),
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('topic', models.CharField(help_text='Метка модели, например posts.post', max_length=100, verbose_name='Модель')),
+                ('action', models.CharField(choices=[('created', 'Создание'), ('updated', 'Изменение'), ('deleted', 'Удаление')], max_length=10, verbose_name='Действие')),
+                ('object_id', models.PositiveIntegerField(verbose_name='id объекта')),
+                ('payload', models.TextField(help_text='Поля объекта в JSON на момент события', verbose_name='Данные')),
+            ],
+            options={
+                'verbose_name': 'Событие',
+                'verbose_name_plural': 'События',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -1,4 +1,9 @@
-from django.db import models
+import json
+
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.utils import timezone
 
 
 class CreatedModel(models.Model):
@@ -12,3 +17,164 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class Task(CreatedModel):
+    """Отложенная задача для фонового обработчика (runworker)."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        verbose_name='Задача',
+        max_length=200,
+        help_text='Имя зарегистрированной задачи'
+    )
+    payload = models.TextField(
+        verbose_name='Аргументы',
+        default='{}',
+        help_text='Именованные аргументы задачи в JSON'
+    )
+    status = models.CharField(
+        verbose_name='Состояние',
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попытки',
+        default=0
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        verbose_name='Максимум попыток',
+        default=3
+    )
+    run_at = models.DateTimeField(
+        verbose_name='Запуск не раньше',
+        default=timezone.now
+    )
+    locked_by = models.CharField(
+        verbose_name='Обработчик',
+        max_length=64,
+        blank=True
+    )
+    locked_at = models.DateTimeField(
+        verbose_name='Взята в работу',
+        null=True,
+        blank=True
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True
+    )
+
+    def __str__(self):
+        return f'{self.name} [{self.status}]'
+
+    class Meta:
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ['run_at']
+        indexes = [models.Index(fields=['status', 'run_at'])]
+
+
+class Event(models.Model):
+    """Событие изменения модели в журнале outbox.
+
+    id события служит смещением для потребителей журнала.
+    """
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTIONS = (
+        (CREATED, 'Создание'),
+        (UPDATED, 'Изменение'),
+        (DELETED, 'Удаление'),
+    )
+
+    created = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True
+    )
+    topic = models.CharField(
+        verbose_name='Модель',
+        max_length=100,
+        help_text='Метка модели, например posts.post'
+    )
+    action = models.CharField(
+        verbose_name='Действие',
+        max_length=10,
+        choices=ACTIONS
+    )
+    object_id = models.PositiveIntegerField(
+        verbose_name='id объекта'
+    )
+    payload = models.TextField(
+        verbose_name='Данные',
+        help_text='Поля объекта в JSON на момент события'
+    )
+
+    def __str__(self):
+        return f'{self.pk}: {self.topic} {self.object_id} {self.action}'
+
+    @property
+    def data(self):
+        return json.loads(self.payload)
+
+    @classmethod
+    def record(cls, instance, action):
+        fields = serializers.serialize('python', [instance])[0]['fields']
+        return cls.objects.create(
+            topic=instance._meta.label_lower,
+            action=action,
+            object_id=instance.pk,
+            payload=json.dumps(fields, cls=DjangoJSONEncoder),
+        )
+
+    class Meta:
+        verbose_name = 'Событие'
+        verbose_name_plural = 'События'
+        ordering = ['id']
+
+
+class ConsumerOffset(models.Model):
+    """Последнее обработанное потребителем событие журнала."""
+    name = models.CharField(
+        verbose_name='Потребитель',
+        max_length=100,
+        unique=True
+    )
+    offset = models.PositiveIntegerField(
+        verbose_name='Смещение',
+        default=0
+    )
+
+    def __str__(self):
+        return f'{self.name}: {self.offset}'
+
+    class Meta:
+        verbose_name = 'Смещение потребителя'
+        verbose_name_plural = 'Смещения потребителей'
+
+
+class OutboxModel(models.Model):
+    """Абстрактная модель. Пишет событие в outbox в той же транзакции.
+
+    Удаления (в том числе каскадные) записывает обработчик post_delete,
+    который core.outbox подключает к каждой такой модели: Django
+    рассылает его внутри транзакции удаления.
+    """
+
+    def save(self, *args, **kwargs):
+        action = Event.CREATED if self._state.adding else Event.UPDATED
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            Event.record(self, action)
+
+    class Meta:
+        abstract = True
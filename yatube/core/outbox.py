@@ -0,0 +1,82 @@
+from django.apps import apps
+from django.db.models.signals import post_delete
+
+from .models import ConsumerOffset, Event, OutboxModel
+
+CONSUMERS = {}
+OUTBOX_BATCH_SIZE: int = 100
+
+
+def record_delete(sender, instance, **kwargs):
+    Event.record(instance, Event.DELETED)
+
+
+def connect_deletes():
+    """Подписывает record_delete только на модели журнала.
+
+    Обработчик без sender запретил бы быстрое удаление одним DELETE
+    для всех моделей проекта, включая Task и служебные таблицы.
+    """
+    for model in apps.get_models():
+        if issubclass(model, OutboxModel):
+            post_delete.connect(
+                record_delete, sender=model,
+                dispatch_uid=f'outbox_delete_{model._meta.label_lower}',
+            )
+
+
+def read_events(after=0, topics=None, limit=OUTBOX_BATCH_SIZE):
+    """События журнала со смещением больше after, по порядку."""
+    events = Event.objects.filter(pk__gt=after)
+    if topics:
+        events = events.filter(topic__in=topics)
+    return list(events.order_by('pk')[:limit])
+
+
+class Consumer:
+    """Читатель журнала, хранящий своё смещение в базе.
+
+    handler получает список событий; смещение сдвигается только после
+    успешной обработки, поэтому при сбое пачка будет прочитана снова.
+    """
+
+    def __init__(self, name, handler, topics=None):
+        self.name = name
+        self.handler = handler
+        self.topics = topics
+
+    @property
+    def offset(self):
+        stored = ConsumerOffset.objects.filter(name=self.name).first()
+        return stored.offset if stored else 0
+
+    def commit(self, offset):
+        ConsumerOffset.objects.update_or_create(
+            name=self.name, defaults={'offset': offset}
+        )
+
+    def reset(self, offset=0):
+        """Перематывает журнал, чтобы заново построить производные данные."""
+        self.commit(offset)
+
+    def poll(self, limit=OUTBOX_BATCH_SIZE):
+        """Обрабатывает следующую пачку; возвращает число событий."""
+        events = read_events(self.offset, limit=limit)
+        if not events:
+            return 0
+        matched = [
+            event for event in events
+            if not self.topics or event.topic in self.topics
+        ]
+        if matched:
+            self.handler(matched)
+        self.commit(events[-1].pk)
+        return len(events)
+
+
+def consumer(name, topics=None):
+    """Регистрирует функцию как потребителя журнала для tail_outbox."""
+    def decorator(handler):
+        CONSUMERS[name] = Consumer(name, handler, topics)
+        return handler
+    return decorator
@@ -0,0 +1,120 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.core.paginator import EmptyPage, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+PAGE_WINDOW: int = 2
+
+
+def page_window(number, num_pages, window=PAGE_WINDOW):
+    """Номера страниц для ссылок пагинатора.
+
+    Первая и последняя страницы плюс ``window`` страниц по обе стороны
+    от текущей; ``None`` обозначает пропуск.
+    """
+    low = max(number - window, 1)
+    high = min(number + window, num_pages)
+    pages = []
+    if low > 1:
+        pages.append(1)
+    if low > 2:
+        pages.append(None)
+    pages.extend(range(low, high + 1))
+    if high < num_pages - 1:
+        pages.append(None)
+    if high < num_pages:
+        pages.append(num_pages)
+    return pages
+
+
+class EstimatedCount(int):
+    """Приблизительное количество объектов."""
+
+
+class WindowedPaginator(Paginator):
+    """Пагинатор, который выводит только окно страниц.
+
+    Вместо COUNT может принять ``count`` — число или функцию. Если
+    это ``EstimatedCount``, страницы за пределами оценки не считаются
+    ошибкой, а просто оказываются пустыми.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True, window=PAGE_WINDOW, count=None):
+        super().__init__(
+            object_list, per_page, orphans, allow_empty_first_page
+        )
+        self.window = window
+        self._count = count
+
+    @property
+    def count_is_estimate(self):
+        return isinstance(self.count, EstimatedCount)
+
+    @cached_property
+    def count(self):
+        if callable(self._count):
+            return self._count()
+        if self._count is not None:
+            return self._count
+        return super().count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.count_is_estimate and int(number) > 1:
+                return int(number)
+            raise
+
+    def page(self, number):
+        if not self.count_is_estimate:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom:bottom + self.per_page], number, self
+        )
+
+
+def _cursor_values(item):
+    if isinstance(item, dict):
+        return item['created'], item['id']
+    return item.created, item.pk
+
+
+def encode_cursor(item):
+    """Курсор для ленты: дата создания и id последнего объекта.
+
+    ``item`` — объект модели или строка ``values()`` с полями
+    ``created`` и ``id``.
+    """
+    created, pk = _cursor_values(item)
+    raw = f'{created.isoformat()}|{pk}'
+    return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """Разбирает курсор, при неверном значении бросает ValueError."""
+    if not value:
+        return None
+    padded = value + '=' * (-len(value) % 4)
+    created, pk = urlsafe_b64decode(padded.encode()).decode().split('|')
+    return datetime.fromisoformat(created), int(pk)
+
+
+def keyset_page(queryset, cursor, per_page):
+    """Следующие ``per_page`` объектов после курсора и новый курсор."""
+    queryset = queryset.order_by('-created', '-pk')
+    if cursor is not None:
+        created, pk = cursor
+        queryset = queryset.filter(
+            Q(created__lt=created) | Q(created=created, pk__lt=pk)
+        )
+    items = list(queryset[:per_page + 1])
+    next_cursor = None
+    if len(items) > per_page:
+        next_cursor = encode_cursor(items[per_page - 1])
+    return items[:per_page], next_cursor
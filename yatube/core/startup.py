@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+
+# Выполняется в отдельном процессе с `python -X importtime`: считает
+# время импорта Django и django.setup(), создания WSGI-обработчика
+# и каждого AppConfig.ready().
+PROFILE_SCRIPT = '''
+import json, time
+started = time.perf_counter()
+from django.apps.config import AppConfig
+
+create = AppConfig.create.__func__
+ready_times = {}
+
+
+def timed_create(cls, entry):
+    config = create(cls, entry)
+    ready = config.ready
+
+    def timed_ready():
+        started = time.perf_counter()
+        ready()
+        ready_times[config.label] = time.perf_counter() - started
+    config.ready = timed_ready
+    return config
+
+
+AppConfig.create = classmethod(timed_create)
+import django
+django.setup()
+setup = time.perf_counter() - started
+from django.core.handlers.wsgi import WSGIHandler
+WSGIHandler()
+print(json.dumps({
+    'setup': setup,
+    'total': time.perf_counter() - started,
+    'ready': ready_times,
+}))
+'''
+
+
+def parse_importtime(stderr):
+    """Строки `-X importtime`: (модуль, собственное и общее время, с)."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        modules.append((
+            name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6
+        ))
+    return modules
+
+
+def profile_startup(profile=None):
+    """Запускает холодный старт в новом процессе и возвращает замеры."""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+    if profile:
+        env['YATUBE_SETTINGS_PROFILE'] = profile
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROFILE_SCRIPT],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['modules'] = parse_importtime(result.stderr)
+    return report
+
+
+def time_by_package(modules):
+    """Собственное время импорта, сложенное по корневым пакетам."""
+    totals = defaultdict(float)
+    for name, self_time, _ in modules:
+        totals[name.split('.')[0]] += self_time
+    return sorted(totals.items(), key=lambda item: -item[1])
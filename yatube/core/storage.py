@@ -0,0 +1,78 @@
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.html', '.json', '.xml',
+)
+MIN_COMPRESS_SIZE = 256
+
+
+def _gzip(content):
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def _brotli(content):
+    return brotli.compress(content, quality=11)
+
+
+COMPRESSORS = [('.gz', _gzip)]
+if brotli is not None:
+    COMPRESSORS.append(('.br', _brotli))
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Манифест с хешированными именами и сжатыми копиями файлов.
+
+    collectstatic кладёт рядом с каждым хешированным текстовым файлом
+    его .gz (и .br, если установлен brotli) вариант. Пока collectstatic
+    не запускался, отдаются исходные имена файлов.
+    """
+
+    manifest_strict = False
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            for compressed_name in self.compress(hashed_name):
+                yield hashed_name, compressed_name, True
+
+    def compress(self, name):
+        if not name.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compressor in COMPRESSORS:
+            compressed = compressor(content)
+            if len(compressed) >= len(content):
+                continue
+            compressed_name = name + suffix
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
+            yield compressed_name
+
+
+def is_hashed_name(name):
+    """Проверяет, что в имени файла есть хеш содержимого манифеста."""
+    stem = os.path.splitext(os.path.basename(name))[0]
+    file_hash = os.path.splitext(stem)[1][1:]
+    return len(file_hash) == 12 and all(
+        char in '0123456789abcdef' for char in file_hash
+    )
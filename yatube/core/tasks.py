@@ -0,0 +1,136 @@
+import json
+import logging
+import traceback
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+TASK_BATCH_SIZE: int = 50
+# задача, взятая обработчиком и не завершённая за это время,
+# считается брошенной и снова попадает в очередь
+TASK_LOCK_TIMEOUT = timedelta(minutes=5)
+RETRY_DELAY: int = 10
+
+
+def task(name=None, batch=False, max_attempts=3):
+    """Регистрирует функцию как фоновую задачу.
+
+    У функции появляется метод delay(**kwargs), ставящий её в очередь.
+    Пакетная задача (batch=True) получает список аргументов всех
+    задач с этим именем, взятых обработчиком за один проход. Она может
+    вернуть {номер элемента: текст ошибки}: повторены будут только эти
+    элементы, остальные считаются выполненными.
+    """
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        TASKS[task_name] = (func, batch, max_attempts)
+        func.task_name = task_name
+        func.delay = lambda **kwargs: enqueue(task_name, **kwargs)
+        return func
+    return decorator
+
+
+def enqueue(name, **kwargs):
+    """Ставит задачу в очередь (или выполняет сразу при TASKS_EAGER)."""
+    func, batch, max_attempts = TASKS[name]
+    if settings.TASKS_EAGER:
+        func([kwargs]) if batch else func(**kwargs)
+        return None
+    return Task.objects.create(
+        name=name,
+        payload=json.dumps(kwargs),
+        max_attempts=max_attempts,
+    )
+
+
+def claim_tasks(worker_id, batch_size=TASK_BATCH_SIZE):
+    """Забирает готовые к запуску задачи, помечая их своим обработчиком.
+
+    Обновление с условием на состояние не даёт двум обработчикам
+    взять одну и ту же задачу.
+    """
+    now = timezone.now()
+    ready = Q(status=Task.PENDING, run_at__lte=now) | Q(
+        status=Task.RUNNING, locked_at__lt=now - TASK_LOCK_TIMEOUT
+    )
+    ids = list(
+        Task.objects.filter(ready).values_list('id', flat=True)[:batch_size]
+    )
+    Task.objects.filter(ready, pk__in=ids).update(
+        status=Task.RUNNING, locked_by=worker_id, locked_at=now
+    )
+    return list(Task.objects.filter(
+        pk__in=ids, status=Task.RUNNING, locked_by=worker_id
+    ))
+
+
+def _finish(tasks):
+    Task.objects.filter(pk__in=[task.pk for task in tasks]).delete()
+
+
+def _retry(tasks, error):
+    for failed in tasks:
+        failed.attempts += 1
+        failed.last_error = error
+        failed.locked_by = ''
+        failed.locked_at = None
+        if failed.attempts >= failed.max_attempts:
+            failed.status = Task.FAILED
+        else:
+            failed.status = Task.PENDING
+            failed.run_at = timezone.now() + timedelta(
+                seconds=RETRY_DELAY * 2 ** (failed.attempts - 1)
+            )
+        failed.save()
+
+
+def _run(func, batch, tasks):
+    failed = {}
+    try:
+        with transaction.atomic():
+            if batch:
+                failed = func(
+                    [json.loads(item.payload) for item in tasks]
+                ) or {}
+            else:
+                func(**json.loads(tasks[0].payload))
+    except Exception:
+        logger.exception('Задача %s завершилась ошибкой', tasks[0].name)
+        _retry(tasks, traceback.format_exc())
+        return
+    for index, error in failed.items():
+        logger.error('Элемент задачи %s не выполнен:\n%s',
+                     tasks[index].name, error)
+        _retry([tasks[index]], error)
+    _finish([item for index, item in enumerate(tasks) if index not in failed])
+
+
+def run_tasks(worker_id=None, batch_size=TASK_BATCH_SIZE):
+    """Выполняет одну пачку задач; возвращает число взятых задач."""
+    worker_id = worker_id or uuid.uuid4().hex
+    tasks = claim_tasks(worker_id, batch_size)
+    by_name = defaultdict(list)
+    for item in tasks:
+        by_name[item.name].append(item)
+    for name, items in by_name.items():
+        if name not in TASKS:
+            _retry(items, f'Неизвестная задача {name}')
+            continue
+        func, batch, _ = TASKS[name]
+        if batch:
+            _run(func, batch, items)
+        else:
+            for item in items:
+                _run(func, batch, [item])
+    return len(tasks)
@@ -0,0 +1,24 @@
+from django import template
+
+from core.paginator import PAGE_WINDOW, encode_cursor, page_window as window
+
+register = template.Library()
+
+
+@register.simple_tag
+def page_window(page_obj):
+    """Окно номеров страниц вокруг текущей, ``None`` — пропуск."""
+    paginator = page_obj.paginator
+    return window(
+        page_obj.number,
+        paginator.num_pages,
+        getattr(paginator, 'window', PAGE_WINDOW),
+    )
+
+
+@register.filter
+def next_cursor(page_obj):
+    """Курсор для подгрузки постов после текущей страницы."""
+    if not page_obj.has_next():
+        return ''
+    return encode_cursor(page_obj[len(page_obj) - 1])
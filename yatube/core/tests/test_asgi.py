@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.test import SimpleTestCase
+
+from core.asgi import MAX_QUEUED_CHUNKS, PooledWsgiToAsgi
+from yatube.asgi import application
+
+SCOPE = {
+    'type': 'http',
+    'http_version': '1.1',
+    'method': 'GET',
+    'query_string': b'',
+    'headers': [(b'host', b'testserver')],
+    'server': ('testserver', 80),
+}
+
+
+def slow_wsgi_app(environ, start_response):
+    time.sleep(0.3)
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'slow']
+
+
+class ASGIApplicationTests(SimpleTestCase):
+    @async_to_sync
+    async def request(self, path, app=application):
+        return await self.fetch(path, app)
+
+    async def fetch(self, path, app):
+        communicator = ApplicationCommunicator(app, {**SCOPE, 'path': path})
+        await communicator.send_input({'type': 'http.request'})
+        start = await communicator.receive_output(timeout=5)
+        body = b''
+        while True:
+            message = await communicator.receive_output(timeout=5)
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                return start, body
+
+    def test_asgi_application_serves_pages(self):
+        """ASGI-приложение отвечает так же, как WSGI."""
+        start, body = self.request('/about/author/')
+        self.assertEqual(start['status'], 200)
+        self.assertIn(b'href="/about/author/"', body)
+
+    def test_requests_run_concurrently(self):
+        """Медленные представления не выстраиваются в один поток."""
+        app = PooledWsgiToAsgi(slow_wsgi_app)
+
+        async def run():
+            return await asyncio.gather(
+                *(self.fetch('/', app) for _ in range(4))
+            )
+        started = time.perf_counter()
+        results = async_to_sync(run)()
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual([body for _, body in results], [b'slow'] * 4)
+
+    def test_slow_client_throttles_large_responses(self):
+        """Большой ответ не накапливается в памяти целиком."""
+        produced = []
+
+        def big_wsgi_app(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            for index in range(1000):
+                produced.append(index)
+                yield b'x' * 10
+
+        async def run():
+            release = asyncio.Event()
+            messages = []
+
+            async def receive():
+                return {'type': 'http.request'}
+
+            async def send(message):
+                messages.append(message)
+                await release.wait()
+            task = asyncio.ensure_future(
+                PooledWsgiToAsgi(big_wsgi_app)(
+                    {**SCOPE, 'path': '/'}, receive, send
+                )
+            )
+            await asyncio.sleep(0.2)
+            buffered = len(produced)
+            release.set()
+            await task
+            return buffered, messages
+        buffered, messages = async_to_sync(run)()
+        self.assertLessEqual(buffered, MAX_QUEUED_CHUNKS + 2)
+        body = b''.join(message.get('body', b'') for message in messages)
+        self.assertEqual(len(body), 10000)
@@ -0,0 +1,126 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, SimpleTestCase
+from django.utils.cache import get_cache_key
+
+from core.caching import invalidate_personal_pages, stale_while_revalidate
+
+
+class StaleWhileRevalidateTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.calls = 0
+
+        self.users = []
+
+        @stale_while_revalidate(20, key_prefix='test')
+        def view(request):
+            self.calls += 1
+            self.users.append(getattr(request, 'user', None))
+            time.sleep(0.05)
+            if request.GET.get('csrf'):
+                get_token(request)
+            return HttpResponse(f'ответ {self.calls}')
+        self.view = view
+
+    def get(self):
+        return self.view(self.factory.get('/page/'))
+
+    def age_entry(self, seconds):
+        """Сдвигает момент свежести записи в прошлое."""
+        key = get_cache_key(self.factory.get('/page/'), 'test', 'GET', cache)
+        response, fresh_until = cache.get(key)
+        cache.set(key, (response, fresh_until - seconds))
+
+    def test_fresh_entry_served_from_cache(self):
+        self.assertEqual(self.get().content, 'ответ 1'.encode())
+        self.assertEqual(self.get().content, 'ответ 1'.encode())
+        self.assertEqual(self.calls, 1)
+
+    def test_concurrent_cold_misses_compute_once(self):
+        """Одновременные запросы к пустому кешу считают страницу один раз."""
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(self.get()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual({r.content for r in responses}, {'ответ 1'.encode()})
+
+    def test_stale_served_while_locked(self):
+        """Пока один запрос пересчитывает, остальные получают старый ответ."""
+        self.get()
+        self.age_entry(60)
+        lock = mock.patch('core.caching.cache.add', return_value=False)
+        with lock:
+            self.assertEqual(self.get().content, 'ответ 1'.encode())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.get().content, 'ответ 2'.encode())
+        self.assertEqual(self.get().content, 'ответ 2'.encode())
+
+    def test_refresh_ahead_in_background(self):
+        """Перед истечением свежести запись обновляется в фоне."""
+        self.get()
+        self.age_entry(18)
+        request = self.factory.get('/page/')
+        request.user = mock.Mock(is_authenticated=False)
+        with mock.patch('core.caching.start_refresh',
+                        side_effect=lambda refresh: refresh()):
+            self.assertEqual(self.view(request).content, 'ответ 1'.encode())
+        self.assertEqual(self.calls, 2)
+        self.assertIsInstance(self.users[-1], AnonymousUser)
+        self.assertEqual(self.get().content, 'ответ 2'.encode())
+
+    def user_request(self, pk):
+        request = self.factory.get('/page/')
+        request.user = mock.Mock(is_authenticated=True, pk=pk)
+        return request
+
+    def test_users_get_own_entries(self):
+        """Вошедший пользователь не видит общую и чужую запись."""
+        self.get()
+        self.assertEqual(
+            self.view(self.user_request(1)).content, 'ответ 2'.encode()
+        )
+        self.assertEqual(
+            self.view(self.user_request(2)).content, 'ответ 3'.encode()
+        )
+        response = self.view(self.user_request(1))
+        self.assertEqual(response.content, 'ответ 2'.encode())
+        self.assertIn('private', response['Cache-Control'])
+        self.assertEqual(self.get().content, 'ответ 1'.encode())
+
+    def test_invalidated_user_gets_new_entry(self):
+        """После сброса пользователь получает новую страницу, другие — нет."""
+        self.view(self.user_request(1))
+        self.view(self.user_request(2))
+        with mock.patch('core.caching.transaction.on_commit'):
+            invalidate_personal_pages(1)
+        self.assertEqual(
+            self.view(self.user_request(1)).content, 'ответ 3'.encode()
+        )
+        self.assertEqual(
+            self.view(self.user_request(2)).content, 'ответ 2'.encode()
+        )
+
+    def test_csrf_page_not_cached(self):
+        """Страница с CSRF-токеном посетителя не попадает в кеш."""
+        self.view(self.factory.get('/page/?csrf=1'))
+        self.view(self.factory.get('/page/?csrf=1'))
+        self.assertEqual(self.calls, 2)
+
+    def test_post_not_cached(self):
+        self.view(self.factory.post('/page/'))
+        self.view(self.factory.post('/page/'))
+        self.assertEqual(self.calls, 2)
@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+
+from core.counting import (EstimatedCountPaginator, estimated_count,
+                           table_row_estimate)
+from core.paginator import EstimatedCount
+from posts.models import Post
+
+User = get_user_model()
+
+
+class EstimatedCountTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'Пост {i}') for i in range(15)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_exact_count_below_threshold(self):
+        """Ниже порога считается точное количество."""
+        count = estimated_count(Post.objects.all(), threshold=100)
+        self.assertEqual(count, 15)
+        self.assertNotIsInstance(count, EstimatedCount)
+
+    def test_cached_count_above_threshold(self):
+        """Выше порога повторный подсчёт берётся из кеша без COUNT."""
+        posts = self.author.posts.all()
+        self.assertEqual(estimated_count(posts, threshold=10), 15)
+        Post.objects.create(author=self.author, text='Новый пост')
+        with self.assertNumQueries(0):
+            count = estimated_count(posts, threshold=10)
+        self.assertEqual(count, 15)
+        self.assertIsInstance(count, EstimatedCount)
+
+    def test_table_statistics_estimate(self):
+        """Для всей таблицы используется статистика ANALYZE."""
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.assertEqual(table_row_estimate(Post), 15)
+        with self.assertNumQueries(2):
+            count = estimated_count(Post.objects.all(), threshold=10)
+        self.assertEqual(count, 15)
+        self.assertIsInstance(count, EstimatedCount)
+
+    def test_paginator_uses_estimate(self):
+        """Пагинатор считает объекты через estimated_count."""
+        paginator = EstimatedCountPaginator(self.author.posts.all(), 10)
+        self.assertEqual(paginator.count, 15)
+        self.assertEqual(paginator.num_pages, 2)
@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.identity import identity_get, use_identity_map
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class IdentityMapTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, group=cls.group, text=f'Пост {i}')
+            for i in range(5)
+        )
+
+    def test_foreign_keys_loaded_once(self):
+        """Повторные обращения к одному автору не делают запросов."""
+        posts = list(Post.objects.all())
+        with use_identity_map() as identity_map:
+            with self.assertNumQueries(1):
+                authors = {id(post.author) for post in posts}
+        self.assertEqual(len(authors), 1)
+        self.assertEqual(identity_map.saved_queries, 4)
+
+    def test_without_identity_map(self):
+        """Вне запроса внешние ключи загружаются как обычно."""
+        posts = list(Post.objects.all())
+        with self.assertNumQueries(5):
+            for post in posts:
+                post.author
+
+    def test_identity_get(self):
+        """identity_get берёт объект из карты, если он уже загружен."""
+        with use_identity_map():
+            with self.assertNumQueries(1):
+                first = identity_get(User, self.author.pk)
+                second = identity_get(User, self.author.pk)
+        self.assertIs(first, second)
+
+    def test_saved_queries_report(self):
+        """Middleware сообщает, сколько запросов сэкономлено."""
+        post = Post.objects.first()
+        Comment.objects.bulk_create(
+            Comment(post=post, author=self.author, text=f'Комментарий {i}')
+            for i in range(3)
+        )
+        with self.assertLogs('core.identity', 'DEBUG') as logs:
+            Client().get(
+                reverse('posts:post_detail', kwargs={'post_id': post.id})
+            )
+        self.assertIn('identity map saved 3 queries', logs.output[0])
+
+    def test_request_user_in_map(self):
+        """Свой пост: автор и комментатор берутся из request.user."""
+        post = Post.objects.first()
+        Comment.objects.create(post=post, author=self.author, text='Свой')
+        client = Client()
+        client.force_login(self.author)
+        with self.assertLogs('core.identity', 'DEBUG') as logs:
+            response = client.get(
+                reverse('posts:post_detail', kwargs={'post_id': post.id})
+            )
+        user = response.wsgi_request.user
+        self.assertIs(response.context['author'], user._wrapped)
+        self.assertIn('identity map saved 2 queries', logs.output[0])
+
+    def test_missing_post_is_404(self):
+        response = Client().get(
+            reverse('posts:post_detail', kwargs={'post_id': 10 ** 6})
+        )
+        self.assertEqual(response.status_code, 404)
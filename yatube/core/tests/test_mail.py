@@ -0,0 +1,85 @@
+import json
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+
+from core.models import Task
+from core.tasks import run_tasks
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+
+class FlakyBackend(EmailBackend):
+    """Не может отправить письма на адреса с «bounce»."""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any('bounce' in address for address in message.recipients()):
+                raise ConnectionError('обрыв соединения')
+            message.message().as_bytes(linesep='\r\n')
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    QUEUED_EMAIL_BACKEND='core.tests.test_mail.CountingBackend',
+)
+class QueuedEmailBackendTests(TestCase):
+    def setUp(self):
+        CountingBackend.opened = 0
+
+    def test_messages_queued_not_sent(self):
+        sent = mail.send_mail('Тема', 'Текст', 'from@example.com',
+                              ['to@example.com'])
+        self.assertEqual(sent, 1)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(Task.objects.get().name, 'core.mail.deliver')
+
+    def test_batch_sent_over_one_connection(self):
+        """Обработчик отправляет всю пачку через одно соединение."""
+        for i in range(5):
+            mail.send_mail(f'Тема {i}', 'Текст', 'from@example.com',
+                           [f'user{i}@example.com'])
+        self.assertEqual(run_tasks(), 5)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(mail.outbox[0].subject, 'Тема 0')
+        self.assertEqual(CountingBackend.opened, 1)
+        self.assertFalse(Task.objects.exists())
+
+    def test_payload_is_plain_json(self):
+        """В данных задачи готовое письмо и адресаты, без pickle."""
+        mail.EmailMessage('Тема', 'Текст', 'from@example.com',
+                          ['to@example.com'], bcc=['bcc@example.com']).send()
+        payload = json.loads(Task.objects.get().payload)
+        self.assertEqual(set(payload), {'message', 'from_email', 'recipients'})
+        self.assertEqual(payload['recipients'],
+                         ['to@example.com', 'bcc@example.com'])
+        run_tasks()
+        self.assertEqual(mail.outbox[0].recipients(),
+                         ['to@example.com', 'bcc@example.com'])
+        self.assertEqual(mail.outbox[0].body, 'Текст')
+
+    @override_settings(
+        QUEUED_EMAIL_BACKEND='core.tests.test_mail.FlakyBackend'
+    )
+    def test_only_unsent_messages_retried(self):
+        """Сбой одного письма не отправляет остальные второй раз."""
+        for address in ('a@example.com', 'bounce@example.com',
+                        'b@example.com'):
+            mail.send_mail('Тема', 'Текст', 'from@example.com', [address])
+        self.assertEqual(run_tasks(), 3)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ['a@example.com', 'b@example.com']
+        )
+        retried = Task.objects.get()
+        self.assertEqual(retried.attempts, 1)
+        self.assertIn('bounce@example.com', retried.payload)
+        self.assertIn('обрыв соединения', retried.last_error)
@@ -0,0 +1,121 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.test import Client, TestCase, override_settings
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+CONTENT = bytes(range(256)) * 4
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class MediaServingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        for name in ('posts/image.gif', 'posts/картинка.jpg',
+                     'cache/ab/cd/thumb.jpg'):
+            fullpath = Path(TEMP_MEDIA_ROOT, name)
+            fullpath.parent.mkdir(parents=True, exist_ok=True)
+            fullpath.write_bytes(CONTENT)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_full_file(self):
+        """Файл отдаётся целиком с ETag и кешированием."""
+        response = self.guest_client.get('/media/posts/image.gif')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertEqual(response['Content-Type'], 'image/gif')
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_thumbnail_is_immutable(self):
+        """Миниатюры кешируются клиентом надолго."""
+        response = self.guest_client.get('/media/cache/ab/cd/thumb.jpg')
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_range_requests(self):
+        """Запрос диапазона возвращает нужную часть файла."""
+        ranges = {
+            'bytes=0-9': (CONTENT[:10], 'bytes 0-9/1024'),
+            'bytes=1000-': (CONTENT[1000:], 'bytes 1000-1023/1024'),
+            'bytes=-4': (CONTENT[-4:], 'bytes 1020-1023/1024'),
+        }
+        for header, (body, content_range) in ranges.items():
+            with self.subTest(header=header):
+                response = self.guest_client.get(
+                    '/media/posts/image.gif', HTTP_RANGE=header
+                )
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(b''.join(response.streaming_content), body)
+                self.assertEqual(response['Content-Range'], content_range)
+                self.assertEqual(response['Content-Length'], str(len(body)))
+
+    def test_unsatisfiable_range(self):
+        """Диапазон за пределами файла возвращает 416."""
+        response = self.guest_client.get(
+            '/media/posts/image.gif', HTTP_RANGE='bytes=5000-'
+        )
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_if_none_match(self):
+        """Совпавший ETag возвращает 304."""
+        etag = self.guest_client.get('/media/posts/image.gif')['ETag']
+        response = self.guest_client.get(
+            '/media/posts/image.gif', HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(MEDIA_OFFLOAD='x-accel')
+    def test_x_accel_offload(self):
+        """При X-Accel-Redirect тело файла не отдаётся из Python."""
+        response = self.guest_client.get('/media/posts/image.gif')
+        self.assertEqual(
+            response['X-Accel-Redirect'], '/protected-media/posts/image.gif'
+        )
+        self.assertEqual(response.content, b'')
+
+    @override_settings(MEDIA_OFFLOAD='x-sendfile')
+    def test_x_sendfile_offload(self):
+        """При X-Sendfile передаётся полный путь к файлу."""
+        response = self.guest_client.get('/media/posts/image.gif')
+        self.assertEqual(
+            response['X-Sendfile'],
+            str(Path(TEMP_MEDIA_ROOT, 'posts/image.gif'))
+        )
+
+    @override_settings(MEDIA_OFFLOAD='x-accel')
+    def test_offload_quotes_unicode_names(self):
+        """Имя файла в заголовке закодировано %XX, а не RFC 2047."""
+        response = self.guest_client.get('/media/posts/картинка.jpg')
+        self.assertEqual(
+            response['X-Accel-Redirect'],
+            '/protected-media/posts/%D0%BA%D0%B0%D1%80%D1%82%D0%B8%D0%BD'
+            '%D0%BA%D0%B0.jpg'
+        )
+        with override_settings(MEDIA_OFFLOAD='x-sendfile'):
+            response = self.guest_client.get('/media/posts/картинка.jpg')
+        self.assertTrue(response['X-Sendfile'].endswith(
+            '/posts/%D0%BA%D0%B0%D1%80%D1%82%D0%B8%D0%BD%D0%BA%D0%B0.jpg'
+        ))
+
+    @override_settings(MEDIA_OFFLOAD='sendfile')
+    def test_unknown_offload_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.guest_client.get('/media/posts/image.gif')
+
+    def test_path_traversal(self):
+        """Файлы вне MEDIA_ROOT недоступны."""
+        response = self.guest_client.get('/media/../manage.py')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,36 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+from core.middleware import absorbed_404_count
+
+
+class Fast404MiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_junk_urls_short_circuit(self):
+        """Запросы к файлам и адресам ботов получают короткий 404."""
+        junk_urls = (
+            '/group/test-slug/img/fav/fav.ico',
+            '/img/fav/favicon-32x32.png',
+            '/wp-login.php',
+            '/.env',
+        )
+        for url in junk_urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+                self.assertEqual(response['Content-Type'], 'text/plain')
+                self.assertTemplateNotUsed(response, 'core/404.html')
+                self.assertFalse(hasattr(response.wsgi_request, 'user'))
+        self.assertEqual(absorbed_404_count(), len(junk_urls))
+
+    def test_regular_404_still_rendered(self):
+        """Обычный несуществующий адрес рендерит кастомную 404."""
+        response = self.guest_client.get('/unexisting_page/')
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertTemplateUsed(response, 'core/404.html')
+        self.assertEqual(absorbed_404_count(), 0)
@@ -0,0 +1,86 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models.deletion import Collector
+from django.test import TestCase
+
+from core.models import Event, Task
+from core.outbox import CONSUMERS, Consumer, consumer, read_events
+from posts.models import Comment, Follow, Post, TrendingPost
+
+User = get_user_model()
+
+
+class OutboxTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.reader = User.objects.create_user(username='reader')
+
+    def test_changes_recorded(self):
+        post = Post.objects.create(author=self.author, text='Пост')
+        post.text = 'Правка'
+        post.save()
+        Comment.objects.create(post=post, author=self.reader, text='Ответ')
+        Follow.objects.create(user=self.reader, author=self.author)
+        post.delete()
+        events = [(event.topic, event.action) for event in read_events()]
+        self.assertEqual(events, [
+            ('posts.post', Event.CREATED),
+            ('posts.post', Event.UPDATED),
+            ('posts.comment', Event.CREATED),
+            ('posts.follow', Event.CREATED),
+            ('posts.comment', Event.DELETED),
+            ('posts.post', Event.DELETED),
+        ])
+        self.assertEqual(read_events()[1].data['text'], 'Правка')
+        self.assertEqual(read_events()[1].data['author'], self.author.pk)
+
+    def test_other_models_keep_fast_delete(self):
+        collector = Collector(using='default')
+        self.assertTrue(collector.can_fast_delete(Task.objects.all()))
+        self.assertTrue(collector.can_fast_delete(TrendingPost.objects.all()))
+        self.assertFalse(collector.can_fast_delete(Follow.objects.all()))
+
+    def test_event_written_in_same_transaction(self):
+        """Без записи в outbox не сохраняется и сам пост."""
+        with mock.patch.object(Event, 'record', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                Post.objects.create(author=self.author, text='Пост')
+        self.assertFalse(Post.objects.exists())
+
+    def test_consumer_offsets_and_replay(self):
+        seen = []
+        reader = Consumer('test', seen.extend, topics=['posts.post'])
+        Post.objects.create(author=self.author, text='Первый')
+        Follow.objects.create(user=self.reader, author=self.author)
+        Post.objects.create(author=self.author, text='Второй')
+        self.assertEqual(reader.poll(limit=2), 2)
+        self.assertEqual([event.data['text'] for event in seen], ['Первый'])
+        self.assertEqual(reader.poll(), 1)
+        self.assertEqual(reader.poll(), 0)
+        self.assertEqual(reader.offset, Event.objects.last().pk)
+        reader.reset()
+        seen.clear()
+        reader.poll()
+        self.assertEqual(len(seen), 2)
+
+    def test_failed_handler_keeps_offset(self):
+        Post.objects.create(author=self.author, text='Пост')
+        reader = Consumer('broken', mock.Mock(side_effect=RuntimeError))
+        with self.assertRaises(RuntimeError):
+            reader.poll()
+        self.assertEqual(reader.offset, 0)
+
+    def test_tail_outbox_command(self):
+        seen = []
+        consumer('test-command')(seen.extend)
+        self.addCleanup(CONSUMERS.pop, 'test-command')
+        Post.objects.create(author=self.author, text='Пост')
+        out = StringIO()
+        call_command('tail_outbox', 'test-command', '--once', stdout=out)
+        self.assertEqual(len(seen), 1)
+        self.assertIn(f'test-command: смещение {seen[0].pk}', out.getvalue())
@@ -0,0 +1,53 @@
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase
+
+from core.paginator import EstimatedCount, WindowedPaginator, page_window
+
+
+class PageWindowTests(SimpleTestCase):
+    def test_page_window(self):
+        """Окно содержит первую, последнюю и соседние страницы."""
+        cases = {
+            (1, 1): [1],
+            (1, 3): [1, 2, 3],
+            (1, 5000): [1, 2, 3, None, 5000],
+            (4, 5000): [1, 2, 3, 4, 5, 6, None, 5000],
+            (2500, 5000): [1, None, 2498, 2499, 2500, 2501, 2502, None, 5000],
+            (5000, 5000): [1, None, 4998, 4999, 5000],
+        }
+        for (number, num_pages), expected in cases.items():
+            with self.subTest(number=number, num_pages=num_pages):
+                self.assertEqual(page_window(number, num_pages), expected)
+
+    def test_paginator_template_renders_window(self):
+        """Шаблон пагинатора выводит только окно страниц."""
+        page_obj = WindowedPaginator(range(50000), 10).page(2500)
+        html = render_to_string(
+            'posts/includes/paginator.html', {'page_obj': page_obj}
+        )
+        self.assertEqual(html.count('class="page-item'), 13)
+        self.assertIn('?page=5000', html)
+        self.assertNotIn('?page=2497', html)
+
+
+class EstimatedCountTests(SimpleTestCase):
+    def test_estimated_count_replaces_exact(self):
+        """Оценка количества используется вместо COUNT."""
+        paginator = WindowedPaginator(
+            range(95), 10, count=lambda: EstimatedCount(80)
+        )
+        self.assertTrue(paginator.count_is_estimate)
+        self.assertEqual(paginator.num_pages, 8)
+
+    def test_precomputed_exact_count(self):
+        """Переданное обычное число считается точным."""
+        paginator = WindowedPaginator(range(95), 10, count=95)
+        self.assertFalse(paginator.count_is_estimate)
+        self.assertEqual(paginator.get_page(20).number, 10)
+
+    def test_pages_beyond_estimate(self):
+        """Страницы за пределами оценки не обрезаются и не падают."""
+        paginator = WindowedPaginator(range(95), 10, count=EstimatedCount(80))
+        self.assertEqual(list(paginator.page(8)), list(range(70, 80)))
+        self.assertEqual(list(paginator.page(10)), list(range(90, 95)))
+        self.assertEqual(list(paginator.get_page(20)), [])
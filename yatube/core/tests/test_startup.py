@@ -0,0 +1,35 @@
+from django.test import SimpleTestCase
+
+from core.startup import parse_importtime, profile_startup, time_by_package
+
+IMPORTTIME_OUTPUT = '''\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     django.utils.version
+import time:       300 |        400 |   django.utils
+import time:      1000 |       1000 | sorl
+import time:       200 |       1600 | django
+'''
+
+
+class StartupProfileTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        modules = parse_importtime(IMPORTTIME_OUTPUT)
+        self.assertEqual(modules[0], ('django.utils.version', 0.0001, 0.0001))
+        self.assertEqual(len(modules), 4)
+
+    def test_time_by_package(self):
+        totals = time_by_package(parse_importtime(IMPORTTIME_OUTPUT))
+        self.assertEqual([package for package, _ in totals],
+                         ['sorl', 'django'])
+        self.assertAlmostEqual(totals[1][1], 0.0006)
+
+    def test_production_profile_skips_debug_toolbar(self):
+        """В production отладочная панель не импортируется."""
+        report = profile_startup('production')
+        self.assertIn('posts', report['ready'])
+        self.assertNotIn('debug_toolbar', report['ready'])
+        self.assertFalse(any(
+            name.startswith('debug_toolbar') for name, _, _ in
+            report['modules']
+        ))
+        self.assertGreater(report['total'], report['setup'] * 0.99)
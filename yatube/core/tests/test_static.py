@@ -0,0 +1,55 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import Client, TestCase, override_settings
+
+TEMP_STATIC_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(STATIC_ROOT=TEMP_STATIC_ROOT)
+class StaticPipelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_STATIC_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_static_url_is_hashed(self):
+        """После collectstatic в шаблонах используются хешированные имена."""
+        url = static('css/bootstrap.min.css')
+        self.assertRegex(
+            url, r'^/static/css/bootstrap\.min\.[0-9a-f]{12}\.css$'
+        )
+
+    def test_hashed_file_is_immutable_and_precompressed(self):
+        """Хешированный файл отдаётся сжатым и кешируется навсегда."""
+        url = static('css/bootstrap.min.css')
+        response = self.guest_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_plain_file_without_accept_encoding(self):
+        """Без Accept-Encoding отдаётся исходный файл."""
+        url = static('css/bootstrap.min.css')
+        response = self.guest_client.get(url)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.guest_client.get('/static/css/bootstrap.min.css')
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_missing_file(self):
+        """Несуществующий файл статики возвращает 404."""
+        response = self.guest_client.get('/static/css/missing.css')
+        self.assertEqual(response.status_code, 404)
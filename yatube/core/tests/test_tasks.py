@@ -0,0 +1,87 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import Task
+from core.tasks import TASK_LOCK_TIMEOUT, claim_tasks, run_tasks, task
+
+CALLS = []
+
+
+@task(name='tests.record')
+def record(value):
+    CALLS.append(value)
+
+
+@task(name='tests.flaky', max_attempts=2)
+def flaky():
+    raise RuntimeError('сбой')
+
+
+@task(name='tests.batch', batch=True)
+def record_batch(items):
+    CALLS.append(sorted(item['value'] for item in items))
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_delay_stores_task(self):
+        record.delay(value=1)
+        stored = Task.objects.get()
+        self.assertEqual(stored.name, 'tests.record')
+        self.assertEqual(stored.payload, '{"value": 1}')
+        self.assertEqual(CALLS, [])
+
+    def test_worker_runs_and_removes_tasks(self):
+        record.delay(value=1)
+        record.delay(value=2)
+        self.assertEqual(run_tasks(), 2)
+        self.assertEqual(CALLS, [1, 2])
+        self.assertFalse(Task.objects.exists())
+
+    def test_batch_task_called_once(self):
+        """Пакетная задача получает все свои экземпляры одним вызовом."""
+        for value in (3, 1, 2):
+            record_batch.delay(value=value)
+        run_tasks()
+        self.assertEqual(CALLS, [[1, 2, 3]])
+
+    def test_failed_task_retried_then_failed(self):
+        flaky.delay()
+        run_tasks()
+        retried = Task.objects.get()
+        self.assertEqual(retried.status, Task.PENDING)
+        self.assertEqual(retried.attempts, 1)
+        self.assertIn('сбой', retried.last_error)
+        self.assertGreater(retried.run_at, timezone.now())
+        self.assertEqual(run_tasks(), 0)
+        Task.objects.update(run_at=timezone.now())
+        run_tasks()
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+
+    def test_locked_task_not_claimed_twice(self):
+        record.delay(value=1)
+        self.assertEqual(len(claim_tasks('first')), 1)
+        self.assertEqual(claim_tasks('second'), [])
+        Task.objects.update(
+            locked_at=timezone.now() - TASK_LOCK_TIMEOUT - timedelta(1)
+        )
+        self.assertEqual(len(claim_tasks('second')), 1)
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode(self):
+        record.delay(value=5)
+        self.assertEqual(CALLS, [5])
+        self.assertFalse(Task.objects.exists())
+
+    def test_runworker_once(self):
+        record.delay(value=1)
+        out = StringIO()
+        call_command('runworker', '--once', stdout=out)
+        self.assertEqual(CALLS, [1])
+        self.assertIn('Обработано задач: 1', out.getvalue())
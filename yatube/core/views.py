@@ -1,4 +1,25 @@
+import mimetypes
+import posixpath
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseNotModified, StreamingHttpResponse)
 from django.shortcuts import render
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .storage import is_hashed_name
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+STATIC_CACHE_CONTROL = 'public, max-age=300'
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+MEDIA_CACHE_CONTROL = 'public, max-age=86400'
+THUMBNAIL_PREFIX = getattr(settings, 'THUMBNAIL_PREFIX', 'cache/')
+RANGE_CHUNK_SIZE = 64 * 1024
 
 
 def page_not_found(request, exception):
@@ -11,3 +32,175 @@ def csrf_failure(request, reason=''):
 
 def server_error(request):
     return render(request, 'core/500.html', {'path': request.path}, status=500)
+
+
+def _accepted_encodings(request):
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00'):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def serve_static(request, path):
+    """Отдаёт собранную статику из STATIC_ROOT.
+
+    Хешированные файлы кешируются клиентом навсегда, сжатая копия
+    выбирается по заголовку Accept-Encoding.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = Path(safe_join(settings.STATIC_ROOT, path))
+    if not fullpath.is_file():
+        raise Http404(f'"{path}" does not exist')
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    served_path = fullpath
+    content_encoding = None
+    accepted = _accepted_encodings(request)
+    for coding, suffix in PRECOMPRESSED_ENCODINGS:
+        candidate = fullpath.with_name(fullpath.name + suffix)
+        if coding in accepted and candidate.is_file():
+            served_path, content_encoding = candidate, coding
+            break
+    statobj = served_path.stat()
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'),
+                              statobj.st_mtime, statobj.st_size):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(
+            served_path.open('rb'),
+            content_type=content_type or 'application/octet-stream',
+        )
+        response['Last-Modified'] = http_date(statobj.st_mtime)
+        if content_encoding:
+            response['Content-Encoding'] = content_encoding
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = (
+        IMMUTABLE_CACHE_CONTROL if is_hashed_name(path)
+        else STATIC_CACHE_CONTROL
+    )
+    return response
+
+
+def _media_etag(statobj):
+    return f'"{statobj.st_size:x}-{statobj.st_mtime_ns:x}"'
+
+
+def _parse_range(header, size):
+    """Разбирает одиночный диапазон ``bytes=start-end``.
+
+    Возвращает ``(start, end)`` включительно, ``None`` если заголовок
+    не поддерживается и ``False`` если диапазон невыполним.
+    """
+    unit, _, ranges = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in ranges:
+        return None
+    start, _, end = ranges.strip().partition('-')
+    try:
+        if not start:
+            suffix = int(end)
+            if suffix <= 0:
+                return False
+            return max(size - suffix, 0), size - 1
+        start = int(start)
+        end = int(end) if end else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def _range_iterator(fileobj, start, length):
+    try:
+        fileobj.seek(start)
+        while length > 0:
+            chunk = fileobj.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+def _offload_response(path, fullpath, content_type):
+    # nginx и mod_xsendfile раскодируют %XX; без quote имя с кириллицей
+    # ушло бы в заголовок как RFC 2047 и файл не нашёлся бы
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_OFFLOAD == 'x-accel':
+        response['X-Accel-Redirect'] = quote(
+            settings.MEDIA_ACCEL_PREFIX + path
+        )
+    elif settings.MEDIA_OFFLOAD == 'x-sendfile':
+        response['X-Sendfile'] = quote(str(fullpath))
+    else:
+        raise ImproperlyConfigured(
+            f'Неизвестное значение MEDIA_OFFLOAD: {settings.MEDIA_OFFLOAD!r}'
+        )
+    return response
+
+
+def serve_media(request, path):
+    """Отдаёт загруженные файлы и миниатюры из MEDIA_ROOT.
+
+    Поддерживает запросы диапазонов и условные запросы по ETag.
+    При ``MEDIA_OFFLOAD`` тело файла отдаёт фронтовой сервер.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    if not fullpath.is_file():
+        raise Http404(f'"{path}" does not exist')
+    statobj = fullpath.stat()
+    etag = _media_etag(statobj)
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    content_type = content_type or 'application/octet-stream'
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        not_modified = etag in if_none_match or if_none_match.strip() == '*'
+    else:
+        not_modified = not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'),
+            statobj.st_mtime, statobj.st_size
+        )
+    if not_modified:
+        response = HttpResponseNotModified()
+    elif settings.MEDIA_OFFLOAD:
+        response = _offload_response(path, fullpath, content_type)
+    else:
+        response = _media_file_response(request, fullpath, statobj, etag,
+                                        content_type)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(statobj.st_mtime)
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = (
+        IMMUTABLE_CACHE_CONTROL if path.startswith(THUMBNAIL_PREFIX)
+        else MEDIA_CACHE_CONTROL
+    )
+    return response
+
+
+def _media_file_response(request, fullpath, statobj, etag, content_type):
+    size = statobj.st_size
+    range_header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if range_header and (if_range is None or if_range == etag):
+        byte_range = _parse_range(range_header, size)
+        if byte_range is False:
+            response = HttpResponse(status=416, content_type=content_type)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _range_iterator(fullpath.open('rb'), start, length),
+                status=206,
+                content_type=content_type,
+            )
+            response['Content-Length'] = str(length)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            return response
+    return FileResponse(fullpath.open('rb'), content_type=content_type)
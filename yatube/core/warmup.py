@@ -0,0 +1,54 @@
+import os
+import time
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+from django.test import Client
+from django.urls import get_resolver
+
+
+def template_names():
+    """Имена всех шаблонов проекта и приложений."""
+    engine = engines['django'].engine
+    names = set()
+    for directory in (*engine.dirs, *get_app_template_dirs('templates')):
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(('.html', '.txt')):
+                    path = os.path.join(root, filename)
+                    names.add(os.path.relpath(path, directory))
+    return sorted(names)
+
+
+def compile_templates():
+    """Компилирует шаблоны в кеш загрузчика, возвращает их число."""
+    compiled = 0
+    for name in template_names():
+        try:
+            engines['django'].get_template(name)
+        except TemplateSyntaxError:
+            continue
+        compiled += 1
+    return compiled
+
+
+def prime_urls():
+    """Заполняет обратные индексы резолвера URL."""
+    resolver = get_resolver()
+    return len(resolver.reverse_dict) + len(resolver.namespace_dict)
+
+
+def prerender(urls, host=None):
+    """Запрашивает страницы в процессе, заполняя кеши ответами."""
+    client = Client(HTTP_HOST=host or settings.WARMUP_HOST)
+    for url in urls:
+        started = time.perf_counter()
+        response = client.get(url)
+        yield url, response.status_code, time.perf_counter() - started
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
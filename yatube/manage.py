@@ -5,6 +5,8 @@ import sys
 
 def main():
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    # см. yatube/wsgi.py
+    os.environ.setdefault('SETUPTOOLS_USE_DISTUTILS', 'stdlib')
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Post, Group, Follow, Comment
+
+from core.counting import EstimatedCountPaginator
+from .models import Post, Group, Follow, Comment, Reaction
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -8,6 +10,8 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('text',)
     list_filter = ('created',)
     empty_value_display = '-пусто-'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 class GroupAdmin(admin.ModelAdmin):
@@ -26,9 +30,18 @@ class CommentAdmin(admin.ModelAdmin):
     list_display = ('post', 'author', 'text', 'created')
     search_fields = ('post', 'author', 'text', 'created')
     empty_value_display = '-пусто-'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class ReactionAdmin(admin.ModelAdmin):
+    list_display = ('post', 'user', 'kind', 'created')
+    list_filter = ('kind',)
+    empty_value_display = '-пусто-'
 
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
 admin.site.register(Follow, FollowAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(Reaction, ReactionAdmin)
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class PostsConfig(AppConfig):
     name = 'posts'
     verbose_name = 'Посты app'
+
+    def ready(self):
+        from core.identity import install_identity_map
+        from . import signals  # noqa: F401
+        from .groups import GroupRegistryDescriptor
+        from .models import Comment, Follow, Post
+
+        install_identity_map(Post, 'author')
+        Post.group = GroupRegistryDescriptor(Post._meta.get_field('group'))
+        install_identity_map(Comment, 'post', 'author')
+        install_identity_map(Follow, 'user', 'author')
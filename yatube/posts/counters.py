@@ -0,0 +1,129 @@
+import atexit
+import logging
+import os
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+VIEW_COUNTER_SHARDS: int = 16
+
+
+class ViewCounter:
+    """Счётчик просмотров постов в памяти процесса.
+
+    Приращения копятся в шардах (у каждого свой lock, чтобы потоки
+    не ждали друг друга) и раз в flush_interval секунд записываются
+    в Post.views одним коротким пакетом UPDATE. Запись делает фоновый
+    поток из start(), поэтому просмотры попадают в базу и тогда, когда
+    новых запросов нет. При падении процесса теряется не больше, чем
+    набралось за один интервал.
+    """
+
+    def __init__(self, flush_interval, shards=VIEW_COUNTER_SHARDS):
+        self.flush_interval = flush_interval
+        self.shard_count = shards
+        self._reset()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def _reset(self):
+        self.shards = [({}, threading.Lock()) for _ in range(self.shard_count)]
+        self.flush_lock = threading.Lock()
+
+    def start(self):
+        """Запускает поток записи; после fork он перезапускается сам."""
+        if self.thread is None:
+            os.register_at_fork(after_in_child=self._after_fork)
+            atexit.register(self.stop)
+        self._restart()
+
+    def _after_fork(self):
+        # замки могли быть захвачены другим потоком родителя, а его
+        # накопленные просмотры запишет он сам
+        self._reset()
+        self._restart()
+
+    def _restart(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(
+            target=self._run, args=(self.stopped,),
+            name='view-counter-flush', daemon=True,
+        )
+        self.thread.start()
+
+    def _run(self, stopped):
+        while not stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            finally:
+                connection.close()
+
+    def stop(self):
+        """Останавливает поток записи и записывает остаток."""
+        self.stopped.set()
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join()
+        self.flush()
+
+    def _shard(self, post_id):
+        return self.shards[post_id % len(self.shards)]
+
+    def _increment(self, post_id, count):
+        counts, lock = self._shard(post_id)
+        with lock:
+            counts[post_id] = counts.get(post_id, 0) + count
+
+    def add(self, post_id, count=1):
+        self._increment(post_id, count)
+
+    def pending(self, post_id):
+        """Просмотры поста, ещё не записанные в базу этим процессом."""
+        counts, lock = self._shard(post_id)
+        with lock:
+            return counts.get(post_id, 0)
+
+    def drain(self):
+        deltas = {}
+        for counts, lock in self.shards:
+            with lock:
+                deltas.update(counts)
+                counts.clear()
+        return deltas
+
+    def flush(self, blocking=True):
+        """Записывает накопленное; возвращает число обновлённых постов."""
+        if not self.flush_lock.acquire(blocking):
+            return 0
+        try:
+            deltas = self.drain()
+            if not deltas:
+                return 0
+            by_delta = defaultdict(list)
+            for post_id, delta in deltas.items():
+                by_delta[delta].append(post_id)
+            try:
+                with transaction.atomic():
+                    for delta, post_ids in by_delta.items():
+                        Post.objects.filter(pk__in=post_ids).update(
+                            views=F('views') + delta
+                        )
+            except Exception:
+                logger.exception('Не удалось записать счётчики просмотров')
+                for post_id, delta in deltas.items():
+                    self._increment(post_id, delta)
+                return 0
+            return len(deltas)
+        finally:
+            self.flush_lock.release()
+
+
+view_counter = ViewCounter(settings.VIEW_COUNTER_FLUSH_INTERVAL)
@@ -0,0 +1,108 @@
+from django.core.cache import cache
+from django.core.paginator import Page
+
+from core.counting import estimated_count
+from core.paginator import WindowedPaginator
+
+from .models import Post
+
+GLOBAL_FEED = 'global'
+# в кеше лежит только начало ленты: значение остаётся маленьким
+# (memcached не примет больше 1 МБ), дальние страницы идут запросом
+FEED_IDS_LIMIT: int = 1000
+FEED_IDS_TIMEOUT: int = 60 * 5
+POST_CACHE_TIMEOUT: int = 60 * 5
+
+
+def group_feed(group_id):
+    return f'group:{group_id}'
+
+
+def author_feed(author_id):
+    return f'author:{author_id}'
+
+
+def feed_ids_key(feed):
+    return f'feed_ids:{feed}'
+
+
+def post_cache_key(post_id):
+    return f'post:{post_id}'
+
+
+def feed_post_ids(feed, posts):
+    """Первые FEED_IDS_LIMIT id постов ленты и их общее число.
+
+    Хранится в кеше; COUNT нужен, только если лента не уместилась.
+    """
+    key = feed_ids_key(feed)
+    entry = cache.get(key)
+    if entry is None:
+        ids = list(posts.values_list('id', flat=True)[:FEED_IDS_LIMIT])
+        total = len(ids)
+        if total == FEED_IDS_LIMIT:
+            total = estimated_count(posts)
+        entry = {'ids': ids, 'total': total}
+        cache.set(key, entry, FEED_IDS_TIMEOUT)
+    return entry
+
+
+def hydrate_posts(ids):
+    """Посты по списку id в том же порядке.
+
+    Посты берутся из кеша одним ``get_many``; промахи загружаются
+    одним запросом ``id__in`` и кладутся в кеш. Удалённые посты
+    пропускаются.
+    """
+    keys = {post_cache_key(post_id): post_id for post_id in ids}
+    cached = cache.get_many(keys)
+    posts = {keys[key]: post for key, post in cached.items()}
+    missing = [post_id for post_id in ids if post_id not in posts]
+    if missing:
+        loaded = Post.objects.select_related('author').in_bulk(missing)
+        cache.set_many(
+            {post_cache_key(pk): post for pk, post in loaded.items()},
+            POST_CACHE_TIMEOUT
+        )
+        posts.update(loaded)
+    return [posts[post_id] for post_id in ids if post_id in posts]
+
+
+def invalidate_feeds(*feeds):
+    cache.delete_many([feed_ids_key(feed) for feed in feeds])
+
+
+def invalidate_post(post_id):
+    cache.delete(post_cache_key(post_id))
+
+
+class FeedPaginator(WindowedPaginator):
+    """Страницы из закешированного начала ленты, дальние — запросом.
+
+    Страница внутри ``ids`` собирается из кеша постов, остальные —
+    обычным срезом ``posts``.
+    """
+
+    def __init__(self, posts, per_page, ids, count):
+        super().__init__(posts, per_page, count=count)
+        self.cached_ids = ids
+
+    def cached_slice(self, number):
+        """id постов страницы или None, если её нет в списке."""
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top <= len(self.cached_ids) or len(self.cached_ids) >= self.count:
+            return self.cached_ids[bottom:top]
+        return None
+
+    def page(self, number):
+        number = self.validate_number(number)
+        ids = self.cached_slice(number)
+        if ids is None:
+            return super().page(number)
+        return Page(hydrate_posts(ids), number, self)
+
+
+def feed_paginator(feed, posts, per_page):
+    entry = feed_post_ids(feed, posts)
+    return FeedPaginator(posts, per_page, entry['ids'], entry['total'])
@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
+
+from core.caching import personal_version, variant_prefix
+from core.paginator import decode_cursor, keyset_page
+
+from .reactions import attach_reactions
+
+FEED_FRAGMENT_TEMPLATE = 'posts/includes/feed_fragment.html'
+FRAGMENT_CACHE_TIMEOUT: int = 20
+
+
+def wants_fragment(request):
+    """Запрошен ли фрагмент ленты для бесконечной прокрутки."""
+    return request.GET.get('fragment') == '1'
+
+
+def _fragment_key(request, feed_key, version, raw_cursor):
+    # токен берётся из META, поэтому после рендера ключ может смениться
+    prefix = variant_prefix(request, f'feed_fragment:{feed_key}', version)
+    return f'{prefix}:{raw_cursor}'
+
+
+def render_fragment(request, posts, context, feed_key, per_page,
+                    private=False):
+    """Карточки постов после курсора и курсор следующей порции.
+
+    Порция по курсору не зависит от номера страницы, поэтому
+    кешируется отдельно от полной страницы. Карточки вошедшего
+    пользователя содержат его реакции и CSRF-токен в формах, так что
+    его порции кешируются под своим ключом, как в variant_prefix.
+    """
+    raw_cursor = request.GET.get('cursor', '')
+    try:
+        cursor = decode_cursor(raw_cursor)
+    except ValueError:
+        return HttpResponseBadRequest('Invalid cursor')
+    version = personal_version(request)
+    data = cache.get(_fragment_key(request, feed_key, version, raw_cursor))
+    if data is None:
+        page, next_cursor = keyset_page(posts, cursor, per_page)
+        page = attach_reactions(page, request.user)
+        # формы реакций возвращают на саму ленту, а не на фрагмент
+        context = {**context, 'posts': page, 'next_url': request.path}
+        data = {
+            'html': render_to_string(
+                FEED_FRAGMENT_TEMPLATE, context, request=request
+            ),
+            'next': next_cursor,
+        }
+        cache.set(_fragment_key(request, feed_key, version, raw_cursor),
+                  data, FRAGMENT_CACHE_TIMEOUT)
+    response = JsonResponse(data)
+    private = private or request.user.is_authenticated
+    visibility = {'private': True} if private else {'public': True}
+    patch_cache_control(
+        response, max_age=FRAGMENT_CACHE_TIMEOUT, **visibility
+    )
+    return response
@@ -0,0 +1,85 @@
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db.models.fields.related_descriptors import (
+    ForwardManyToOneDescriptor)
+from django.http import Http404
+
+from .models import Group
+
+GROUP_REGISTRY_VERSION_KEY = 'group_registry_version'
+
+
+class GroupRegistry:
+    """Все группы в памяти процесса, по id и по слагу.
+
+    Группы меняются редко, поэтому загружаются целиком один раз.
+    Актуальность проверяется по версии в общем кеше: сигналы
+    сохранения и удаления группы меняют версию, и каждый процесс
+    перечитывает группы при следующем обращении. Возвращаемые объекты
+    общие для всех запросов, изменять их нельзя.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.by_id = {}
+        self.by_slug = {}
+        self.lock = threading.Lock()
+
+    def current_version(self):
+        version = cache.get(GROUP_REGISTRY_VERSION_KEY)
+        if version is None:
+            cache.add(GROUP_REGISTRY_VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(GROUP_REGISTRY_VERSION_KEY)
+        return version
+
+    def refresh(self):
+        version = self.current_version()
+        if version == self.version:
+            return
+        with self.lock:
+            if version == self.version:
+                return
+            groups = list(Group.objects.all())
+            self.by_id = {group.pk: group for group in groups}
+            self.by_slug = {group.slug: group for group in groups}
+            self.version = version
+
+    def invalidate(self):
+        cache.set(GROUP_REGISTRY_VERSION_KEY, uuid.uuid4().hex, None)
+
+    def get(self, pk=None, slug=None):
+        """Группа по id или слагу; ``None``, если такой нет."""
+        self.refresh()
+        if pk is not None:
+            group = self.by_id.get(pk)
+            lookup = {'pk': pk}
+        else:
+            group = self.by_slug.get(slug)
+            lookup = {'slug': slug}
+        if group is None:
+            group = Group.objects.filter(**lookup).first()
+            if group is not None:
+                self.invalidate()
+        return group
+
+
+group_registry = GroupRegistry()
+
+
+def get_group_or_404(slug):
+    group = group_registry.get(slug=slug)
+    if group is None:
+        raise Http404('No Group matches the given query.')
+    return group
+
+
+class GroupRegistryDescriptor(ForwardManyToOneDescriptor):
+    """``post.group`` из реестра групп без запроса к базе."""
+
+    def get_object(self, instance):
+        group = group_registry.get(pk=getattr(instance, self.field.attname))
+        if group is None:
+            return super().get_object(instance)
+        return group
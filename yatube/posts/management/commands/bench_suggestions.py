@@ -0,0 +1,87 @@
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand
+
+from posts.suggestions import SUGGESTIONS_SIZE, FollowGraph
+
+
+def synthetic_edges(users, edges, seed):
+    """Случайные подписки: популярных авторов читают заметно чаще."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(users)]
+    authors = rng.choices(range(users), weights=weights, k=edges)
+    for author in authors:
+        user = rng.randrange(users)
+        if user != author:
+            yield user, author
+
+
+def naive_suggestions(following, user, size):
+    mutual = Counter()
+    for friend in following[user]:
+        mutual.update(following[friend])
+    for known in following[user] | {user}:
+        mutual.pop(known, None)
+    return mutual.most_common(size)
+
+
+class Command(BaseCommand):
+    help = ('Замеряет расчёт рекомендаций подписок на синтетическом графе '
+            'без базы: сжатые массивы против словаря множеств.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50000)
+        parser.add_argument('--edges', type=int, default=1000000)
+        parser.add_argument('--size', type=int, default=SUGGESTIONS_SIZE)
+        parser.add_argument('--sample', type=int, default=2000,
+                            help='Для скольких пользователей сравнить с '
+                                 'словарём множеств.')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        edges = list(synthetic_edges(
+            options['users'], options['edges'], options['seed']
+        ))
+        self.stdout.write(f'Граф: {options["users"]} пользователей, '
+                          f'{len(edges)} подписок')
+
+        started = time.perf_counter()
+        graph = FollowGraph(edges)
+        built = time.perf_counter() - started
+        graph_bytes = sum(
+            sys.getsizeof(part)
+            for part in (graph.ids, graph.offsets, graph.targets)
+        )
+        started = time.perf_counter()
+        total = sum(1 for _ in graph.suggestions(options['size']))
+        ranked = time.perf_counter() - started
+        self.stdout.write(
+            f'массивы: построение {built:.1f} с, {graph_bytes / 2**20:.1f} '
+            f'МиБ; все рекомендации ({total}) за {ranked:.1f} с, '
+            f'{ranked / len(graph) * 1000:.2f} мс на пользователя'
+        )
+
+        following = defaultdict(set)
+        for user, author in edges:
+            following[user].add(author)
+        sets_bytes = sys.getsizeof(following) + sum(
+            sys.getsizeof(authors) for authors in following.values()
+        )
+        sample = list(following)[:options['sample']]
+        started = time.perf_counter()
+        for user in sample:
+            naive_suggestions(following, user, options['size'])
+        naive = time.perf_counter() - started
+        nodes = {user_id: node for node, user_id in enumerate(graph.ids)}
+        started = time.perf_counter()
+        for user in sample:
+            graph.friends_of_friends(nodes[user], options['size'])
+        packed = time.perf_counter() - started
+        self.stdout.write(
+            f'на {len(sample)} пользователях: словарь множеств '
+            f'({sets_bytes / 2**20:.1f} МиБ) {naive * 1000:.0f} мс, '
+            f'массивы {packed * 1000:.0f} мс'
+        )
@@ -0,0 +1,51 @@
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+
+def measure(client, url, params):
+    """Время до первого байта и до конца ответа в секундах."""
+    cache.clear()
+    started = time.perf_counter()
+    response = client.get(url, params)
+    if response.streaming:
+        chunks = iter(response.streaming_content)
+        next(chunks, None)
+        first_byte = time.perf_counter() - started
+        for _ in chunks:
+            pass
+    else:
+        first_byte = time.perf_counter() - started
+    return first_byte, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает TTFB и полное время ответа лент '
+            'в обычном и потоковом режиме на текущей базе.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*', default=['/'])
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--page', default='1')
+
+    def handle(self, *args, **options):
+        client = Client()
+        modes = (
+            ('render', {'page': options['page']}),
+            ('stream', {'page': options['page'], 'stream': '1'}),
+        )
+        for url in options['urls']:
+            for mode, params in modes:
+                samples = [
+                    measure(client, url, params)
+                    for _ in range(options['repeat'])
+                ]
+                ttfb = statistics.median(sample[0] for sample in samples)
+                total = statistics.median(sample[1] for sample in samples)
+                self.stdout.write(
+                    f'{url} [{mode}]: TTFB {ttfb * 1000:.1f} ms, '
+                    f'total {total * 1000:.1f} ms'
+                )
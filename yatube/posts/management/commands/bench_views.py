@@ -0,0 +1,76 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import F
+
+from posts.counters import ViewCounter
+from posts.models import Post
+
+
+def naive_view(post_id):
+    Post.objects.filter(pk=post_id).update(views=F('views') + 1)
+
+
+def run_threads(target, post_ids, threads):
+    """Раскидывает просмотры по потокам; возвращает время в секундах."""
+    def worker(chunk):
+        try:
+            for post_id in chunk:
+                target(post_id)
+        finally:
+            connection.close()
+    chunks = [post_ids[index::threads] for index in range(threads)]
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(chunk,))
+               for chunk in chunks]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность счётчика просмотров: '
+            'UPDATE на каждый просмотр против буфера с пакетной записью.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--views', type=int, default=5000)
+        parser.add_argument('--posts', type=int, default=100,
+                            help='Сколько разных постов просматривается.')
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--flush-interval', type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        ids = list(Post.objects.values_list('pk', flat=True)[
+            :options['posts']])
+        if not ids:
+            self.stderr.write('В базе нет постов.')
+            return
+        post_ids = [ids[i % len(ids)] for i in range(options['views'])]
+        before = sum(Post.objects.filter(pk__in=ids).values_list(
+            'views', flat=True))
+
+        naive = run_threads(naive_view, post_ids, options['threads'])
+        counter = ViewCounter(options['flush_interval'])
+        counter.start()
+        buffered = run_threads(counter.add, post_ids, options['threads'])
+        started = time.perf_counter()
+        counter.stop()
+        final_flush = time.perf_counter() - started
+
+        after = sum(Post.objects.filter(pk__in=ids).values_list(
+            'views', flat=True))
+        self.stdout.write(
+            f'UPDATE на просмотр: {len(post_ids) / naive:10.0f} просм./с'
+        )
+        self.stdout.write(
+            f'буфер + пакеты:     {len(post_ids) / buffered:10.0f} просм./с'
+            f' (последняя запись {final_flush * 1000:.1f} мс)'
+        )
+        self.stdout.write(
+            f'записано просмотров: {after - before} '
+            f'(ожидалось {2 * len(post_ids)})'
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.recent import recent_hit_rate
+
+
+class Command(BaseCommand):
+    help = 'Показывает долю страниц лент, отданных из буфера последних постов.'
+
+    def handle(self, *args, **options):
+        stats = recent_hit_rate()
+        self.stdout.write(
+            f'Буфер последних постов: попаданий {stats["hits"]}, '
+            f'промахов {stats["misses"]}, доля {stats["rate"]:.1%}'
+        )
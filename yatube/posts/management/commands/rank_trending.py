@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.trending import TRENDING_SIZE, rank_trending
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает ленту популярного. С --interval работает '
+            'как периодическая задача.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=TRENDING_SIZE)
+        parser.add_argument('--interval', type=float,
+                            help='Пересчитывать каждые N секунд.')
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                started = time.perf_counter()
+                ranked = rank_trending(size=options['size'])
+                self.stdout.write(
+                    f'Популярное: {ranked} постов за '
+                    f'{(time.perf_counter() - started) * 1000:.1f} мс'
+                )
+                if not options['interval']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.related import RELATED_SIZE, rebuild_related
+
+
+class Command(BaseCommand):
+    help = ('Заново считает похожие записи для всех постов. Новые посты '
+            'между пересчётами добавляет обработчик задач.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=RELATED_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = rebuild_related(size=options['size'])
+        self.stdout.write(
+            f'Похожие записи: {total} постов за '
+            f'{time.perf_counter() - started:.1f} с'
+        )
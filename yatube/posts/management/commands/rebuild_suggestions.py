@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.suggestions import SUGGESTIONS_SIZE, rebuild_suggestions
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает рекомендации подписок (друзья друзей) для всех '
+            'пользователей. После (от)писки их обновляет обработчик задач.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=SUGGESTIONS_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = rebuild_suggestions(size=options['size'])
+        self.stdout.write(
+            f'Рекомендации подписок: {total} за '
+            f'{time.perf_counter() - started:.1f} с'
+        )
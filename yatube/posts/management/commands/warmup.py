@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from posts.warmup import HOT_AUTHORS, HOT_GROUPS, warm_up
+
+
+class Command(BaseCommand):
+    help = ('Компилирует шаблоны, заполняет резолвер URL и кеширует '
+            'первые страницы главной, групп и профилей.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', help='Host, под которым '
+                            'кешируются страницы (WARMUP_HOST).')
+        parser.add_argument('--groups', type=int, default=HOT_GROUPS)
+        parser.add_argument('--authors', type=int, default=HOT_AUTHORS)
+
+    def handle(self, *args, **options):
+        total = 0
+        for label, seconds in warm_up(
+            options['host'], options['groups'], options['authors']
+        ):
+            total += seconds
+            self.stdout.write(f'{seconds * 1000:8.1f} мс  {label}')
+        self.stdout.write(f'{total * 1000:8.1f} мс  всего')
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_auto_20220830_2327'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='views',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Счётчик просмотров, пишется пачками из posts.counters', verbose_name='Просмотры'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_trendingpost'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostVector',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='vector', serialize=False, to='posts.Post', verbose_name='Пост')),
+                ('terms', models.TextField(help_text='Веса термов в JSON, вектор нормирован', verbose_name='Вектор')),
+            ],
+            options={
+                'verbose_name': 'Вектор поста',
+                'verbose_name_plural': 'Векторы постов',
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedPost',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Сходство')),
+            ],
+            options={
+                'verbose_name': 'Похожий пост',
+                'verbose_name_plural': 'Похожие посты',
+            },
+        ),
+        migrations.CreateModel(
+            name='TermFrequency',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=50, unique=True, verbose_name='Терм')),
+                ('documents', models.PositiveIntegerField(default=0, verbose_name='Постов с термом')),
+            ],
+            options={
+                'verbose_name': 'Частота терма',
+                'verbose_name_plural': 'Частоты термов',
+            },
+        ),
+        migrations.AddField(
+            model_name='relatedpost',
+            name='post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_posts', to='posts.Post', verbose_name='Пост'),
+        ),
+        migrations.AddField(
+            model_name='relatedpost',
+            name='related',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='posts.Post', verbose_name='Похожий пост'),
+        ),
+        migrations.AddIndex(
+            model_name='relatedpost',
+            index=models.Index(fields=['post', '-score'], name='posts_relat_post_id_78409f_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='relatedpost',
+            constraint=models.UniqueConstraint(fields=('post', 'related'), name='related_once'),
+        ),
+    ]
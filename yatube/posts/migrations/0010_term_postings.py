@@ -0,0 +1,57 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:51
+
+import json
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_vectors(apps, schema_editor):
+    PostVector = apps.get_model('posts', 'PostVector')
+    TermPosting = apps.get_model('posts', 'TermPosting')
+    TermPosting.objects.bulk_create(
+        (TermPosting(term=term, post_id=post_id, weight=weight)
+         for post_id, terms in PostVector.objects.values_list(
+             'post_id', 'terms').iterator()
+         for term, weight in json.loads(terms).items()),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_followsuggestion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermPosting',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=50, verbose_name='Терм')),
+                ('weight', models.FloatField(verbose_name='Вес')),
+            ],
+            options={
+                'verbose_name': 'Вес терма',
+                'verbose_name_plural': 'Веса термов',
+            },
+        ),
+        migrations.AddField(
+            model_name='termposting',
+            name='post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='posts.Post', verbose_name='Пост'),
+        ),
+        migrations.AddConstraint(
+            model_name='termposting',
+            constraint=models.UniqueConstraint(fields=('term', 'post'), name='posting_once'),
+        ),
+        migrations.RunPython(copy_vectors, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='postvector',
+            name='post',
+        ),
+        migrations.DeleteModel(
+            name='PostVector',
+        ),
+    ]
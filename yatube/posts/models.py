@@ -1,11 +1,11 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from core.models import CreatedModel
+from core.models import CreatedModel, OutboxModel
 
 User = get_user_model()
 
 
-class Post(CreatedModel):
+class Post(OutboxModel, CreatedModel):
     text = models.TextField(
         verbose_name='Текст',
         help_text='Текст поста'
@@ -32,6 +32,12 @@ class Post(CreatedModel):
         blank=True,
         help_text='Изображение к посту'
     )
+    views = models.PositiveIntegerField(
+        verbose_name='Просмотры',
+        default=0,
+        editable=False,
+        help_text='Счётчик просмотров, пишется пачками из posts.counters'
+    )
 
     def __str__(self):
         len_to_show: int = 15
@@ -67,7 +73,7 @@ class Group(models.Model):
         return self.title
 
 
-class Comment(CreatedModel):
+class Comment(OutboxModel, CreatedModel):
     post = models.ForeignKey(
         Post,
         verbose_name='Пост',
@@ -102,7 +108,7 @@ class Comment(CreatedModel):
         ordering = ['-created']
 
 
-class Follow(models.Model):
+class Follow(OutboxModel):
     user = models.ForeignKey(
         User,
         verbose_name='Пользователь',
@@ -133,3 +139,223 @@ class Follow(models.Model):
                 name="prevent_self_follow"
             )
         ]
+
+
+class Reaction(CreatedModel):
+    LIKE = 'like'
+    LOVE = 'love'
+    LAUGH = 'laugh'
+    KINDS = (
+        (LIKE, '👍'),
+        (LOVE, '❤️'),
+        (LAUGH, '😂'),
+    )
+
+    post = models.ForeignKey(
+        Post,
+        verbose_name='Пост',
+        on_delete=models.CASCADE,
+        related_name='reactions',
+        help_text='Пост, на который отреагировали'
+    )
+    user = models.ForeignKey(
+        User,
+        verbose_name='Пользователь',
+        on_delete=models.CASCADE,
+        related_name='reactions',
+        help_text='Кто отреагировал'
+    )
+    kind = models.CharField(
+        verbose_name='Реакция',
+        max_length=10,
+        choices=KINDS
+    )
+
+    def __str__(self):
+        return f'{self.user}: {self.kind}'
+
+    class Meta:
+        verbose_name = 'Реакция'
+        verbose_name_plural = 'Реакции'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'user'], name='one_reaction_per_user'
+            ),
+        ]
+
+
+class ReactionCounter(models.Model):
+    """Шард счётчика реакций; итог — сумма по всем шардам поста."""
+    post = models.ForeignKey(
+        Post,
+        verbose_name='Пост',
+        on_delete=models.CASCADE,
+        related_name='reaction_counters'
+    )
+    kind = models.CharField(
+        verbose_name='Реакция',
+        max_length=10,
+        choices=Reaction.KINDS
+    )
+    shard = models.PositiveSmallIntegerField(
+        verbose_name='Шард'
+    )
+    count = models.IntegerField(
+        verbose_name='Количество',
+        default=0
+    )
+
+    def __str__(self):
+        return f'{self.post_id}/{self.kind}/{self.shard}: {self.count}'
+
+    class Meta:
+        verbose_name = 'Счётчик реакций'
+        verbose_name_plural = 'Счётчики реакций'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'kind', 'shard'], name='one_counter_shard'
+            ),
+        ]
+
+
+class TrendingPost(models.Model):
+    """Место поста в ленте популярного; пересчитывает rank_trending."""
+    post = models.OneToOneField(
+        Post,
+        verbose_name='Пост',
+        on_delete=models.CASCADE,
+        related_name='trending'
+    )
+    rank = models.PositiveIntegerField(
+        verbose_name='Место',
+        unique=True
+    )
+    score = models.FloatField(
+        verbose_name='Рейтинг'
+    )
+
+    def __str__(self):
+        return f'{self.rank}: {self.post_id}'
+
+    class Meta:
+        verbose_name = 'Популярный пост'
+        verbose_name_plural = 'Популярные посты'
+        ordering = ['rank']
+
+
+class TermPosting(models.Model):
+    """Вес терма в нормированном TF-IDF векторе поста.
+
+    Строка инвертированного индекса: посты с общими термами находятся
+    по индексу (term, post), не читая векторы остальных постов.
+    """
+    term = models.CharField(
+        verbose_name='Терм',
+        max_length=50
+    )
+    post = models.ForeignKey(
+        Post,
+        verbose_name='Пост',
+        on_delete=models.CASCADE,
+        related_name='postings'
+    )
+    weight = models.FloatField(
+        verbose_name='Вес'
+    )
+
+    def __str__(self):
+        return f'{self.term} @ {self.post_id}: {self.weight:.3f}'
+
+    class Meta:
+        verbose_name = 'Вес терма'
+        verbose_name_plural = 'Веса термов'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['term', 'post'], name='posting_once'
+            ),
+        ]
+
+
+class TermFrequency(models.Model):
+    """В скольких постах встречается терм (для IDF)."""
+    term = models.CharField(
+        verbose_name='Терм',
+        max_length=50,
+        unique=True
+    )
+    documents = models.PositiveIntegerField(
+        verbose_name='Постов с термом',
+        default=0
+    )
+
+    def __str__(self):
+        return f'{self.term}: {self.documents}'
+
+    class Meta:
+        verbose_name = 'Частота терма'
+        verbose_name_plural = 'Частоты термов'
+
+
+class RelatedPost(models.Model):
+    """Один из ближайших по тексту постов, посчитанных заранее."""
+    post = models.ForeignKey(
+        Post,
+        verbose_name='Пост',
+        on_delete=models.CASCADE,
+        related_name='related_posts'
+    )
+    related = models.ForeignKey(
+        Post,
+        verbose_name='Похожий пост',
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    score = models.FloatField(
+        verbose_name='Сходство'
+    )
+
+    def __str__(self):
+        return f'{self.post_id} ~ {self.related_id}: {self.score:.3f}'
+
+    class Meta:
+        verbose_name = 'Похожий пост'
+        verbose_name_plural = 'Похожие посты'
+        indexes = [models.Index(fields=['post', '-score'])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'related'], name='related_once'
+            ),
+        ]
+
+
+class FollowSuggestion(models.Model):
+    """Автор, на которого подписаны подписки пользователя."""
+    user = models.ForeignKey(
+        User,
+        verbose_name='Пользователь',
+        on_delete=models.CASCADE,
+        related_name='follow_suggestions'
+    )
+    author = models.ForeignKey(
+        User,
+        verbose_name='Автор',
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    mutual = models.PositiveIntegerField(
+        verbose_name='Общих подписок',
+        help_text='Сколько подписок пользователя читают автора'
+    )
+
+    def __str__(self):
+        return f'{self.user} → {self.author}: {self.mutual}'
+
+    class Meta:
+        verbose_name = 'Рекомендация подписки'
+        verbose_name_plural = 'Рекомендации подписок'
+        indexes = [models.Index(fields=['user', '-mutual'])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'author'], name='suggested_once'
+            ),
+        ]
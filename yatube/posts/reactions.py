@@ -0,0 +1,110 @@
+import random
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, IntegerField, Sum, Value
+
+from core.caching import invalidate_personal_pages
+
+from .models import Reaction, ReactionCounter
+
+REACTION_SHARDS: int = 8
+
+
+def _bump(post_id, kind, delta):
+    """Меняет случайный шард счётчика, не блокируя остальные."""
+    shard = random.randrange(REACTION_SHARDS)
+    counters = ReactionCounter.objects.filter(
+        post_id=post_id, kind=kind, shard=shard
+    )
+    if counters.update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            ReactionCounter.objects.create(
+                post_id=post_id, kind=kind, shard=shard, count=delta
+            )
+    except IntegrityError:
+        counters.update(count=F('count') + delta)
+
+
+@transaction.atomic
+def toggle_reaction(user, post_id, kind):
+    """Ставит, меняет или снимает (повторным нажатием) реакцию.
+
+    Возвращает реакцию пользователя после изменения или None.
+    Изменения строки реакции условны, поэтому параллельные запросы
+    не сдвигают счётчик дважды. Закешированные страницы пользователя
+    сбрасываются: в них его прежние реакции.
+    """
+    invalidate_personal_pages(user.pk)
+    current = Reaction.objects.filter(post_id=post_id, user=user).first()
+    if current is None:
+        try:
+            with transaction.atomic():
+                Reaction.objects.create(post_id=post_id, user=user, kind=kind)
+        except IntegrityError:
+            return kind
+        _bump(post_id, kind, 1)
+        return kind
+    same = Reaction.objects.filter(pk=current.pk, kind=current.kind)
+    if current.kind == kind:
+        if same.delete()[0]:
+            _bump(post_id, kind, -1)
+        return None
+    if same.update(kind=kind):
+        _bump(post_id, current.kind, -1)
+        _bump(post_id, kind, 1)
+    return kind
+
+
+def reaction_summary(post_ids, user=None):
+    """Счётчики реакций постов и реакции пользователя одним запросом.
+
+    Возвращает {post_id: ({kind: count}, kind пользователя или None)}.
+    """
+    summary = {post_id: ({}, None) for post_id in post_ids}
+    if not summary:
+        return summary
+    rows = ReactionCounter.objects.filter(post_id__in=post_ids).values(
+        'post_id', 'kind'
+    ).annotate(
+        total=Sum('count'), mine=Value(0, output_field=IntegerField())
+    ).order_by()
+    if user is not None and user.is_authenticated:
+        rows = rows.union(
+            Reaction.objects.filter(post_id__in=post_ids, user=user).annotate(
+                total=Value(0, output_field=IntegerField()),
+                mine=Value(1, output_field=IntegerField()),
+            ).values('post_id', 'kind', 'total', 'mine'),
+            all=True,
+        )
+    for row in rows:
+        counts, mine = summary[row['post_id']]
+        if row['mine']:
+            summary[row['post_id']] = (counts, row['kind'])
+        elif row['total']:
+            counts[row['kind']] = row['total']
+    return summary
+
+
+def set_reaction_counts(post, counts, mine=None):
+    """Кнопки реакций карточки: post.reaction_counts для шаблона."""
+    post.reaction_counts = [
+        {
+            'kind': kind,
+            'label': label,
+            'count': counts.get(kind, 0),
+            'mine': kind == mine,
+        }
+        for kind, label in Reaction.KINDS
+    ]
+    return post
+
+
+def attach_reactions(posts, user=None):
+    """Добавляет постам post.reaction_counts для шаблона карточки."""
+    posts = list(posts)
+    summary = reaction_summary([post.pk for post in posts], user)
+    for post in posts:
+        set_reaction_counts(post, *summary[post.pk])
+    return posts
@@ -0,0 +1,73 @@
+from django.core.cache import cache
+
+from core.counting import estimated_count
+
+from .feeds import FeedPaginator
+
+RECENT_BUFFER_SIZE: int = 50
+# страховка от гонки: запрос, прочитавший базу до записи, может
+# положить в кеш устаревший буфер уже после его сброса
+RECENT_TIMEOUT: int = 60 * 10
+RECENT_HITS_KEY = 'recent_ids_hits'
+RECENT_MISSES_KEY = 'recent_ids_misses'
+
+
+def recent_key(feed):
+    return f'recent_ids:{feed}'
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def recent_hit_rate():
+    """Попадания в буфер последних постов и промахи мимо него."""
+    hits = cache.get(RECENT_HITS_KEY, 0)
+    misses = cache.get(RECENT_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'rate': hits / total if total else 0.0,
+    }
+
+
+def recent_entry(feed, posts):
+    """Буфер ленты: id последних постов и общее число постов.
+
+    Строится запросом при первом обращении. Сигналы модели Post
+    сбрасывают его после коммита, а не правят на месте: два
+    параллельных чтения-записи одного значения потеряли бы пост.
+    """
+    key = recent_key(feed)
+    entry = cache.get(key)
+    if entry is None:
+        ids = list(posts.values_list('id', flat=True)[:RECENT_BUFFER_SIZE])
+        # неполный буфер уже содержит все посты ленты
+        total = len(ids)
+        if total == RECENT_BUFFER_SIZE:
+            total = estimated_count(posts)
+        entry = {'ids': ids, 'total': total}
+        cache.set(key, entry, RECENT_TIMEOUT)
+    return entry
+
+
+def drop_recent(*feeds):
+    cache.delete_many([recent_key(feed) for feed in feeds])
+
+
+class RecentFeedPaginator(FeedPaginator):
+    """Первые страницы из буфера, дальние — обычным запросом."""
+
+    def __init__(self, feed, posts, per_page):
+        entry = recent_entry(feed, posts)
+        super().__init__(posts, per_page, entry['ids'], entry['total'])
+
+    def cached_slice(self, number):
+        ids = super().cached_slice(number)
+        _incr(RECENT_MISSES_KEY if ids is None else RECENT_HITS_KEY)
+        return ids
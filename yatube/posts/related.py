@@ -0,0 +1,208 @@
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from .models import Post, RelatedPost, TermFrequency, TermPosting
+
+RELATED_SIZE: int = 5
+# сколько соседей нового поста пробуют взять его в свой список
+RECIPROCAL_CANDIDATES: int = 50
+# термы, встречающиеся чаще, почти не различают посты
+MAX_DOCUMENT_RATIO = 0.5
+MIN_TOKEN_LENGTH: int = 3
+# грубая замена стемминга: у русских слов отбрасываются окончания
+STEM_LENGTH: int = 6
+SAVE_BATCH_SIZE: int = 500
+TOKEN_RE = re.compile(r'[^\W\d_]+')
+STOP_WORDS = frozenset((
+    'это', 'как', 'так', 'что', 'для', 'все', 'его', 'она', 'они', 'был',
+    'была', 'было', 'были', 'уже', 'или', 'если', 'при', 'над', 'под',
+    'без', 'меня', 'тебя', 'себя', 'тоже', 'только', 'ещё', 'еще', 'где',
+    'когда', 'чтобы', 'нас', 'вас', 'вот', 'там', 'тут', 'the', 'and',
+    'for', 'with', 'that', 'this',
+))
+
+
+def tokenize(text):
+    """Слова текста, урезанные до STEM_LENGTH букв."""
+    return [
+        word[:STEM_LENGTH] for word in TOKEN_RE.findall(text.lower())
+        if len(word) >= MIN_TOKEN_LENGTH and word not in STOP_WORDS
+    ]
+
+
+def idf(documents, total):
+    return math.log((1 + total) / (1 + documents)) + 1
+
+
+def tfidf(counts, frequencies, total):
+    """Нормированный разреженный вектор {терм: вес}."""
+    vector = {
+        term: (1 + math.log(count)) * idf(frequencies[term], total)
+        for term, count in counts.items()
+    }
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if not norm:
+        return {}
+    return {term: weight / norm for term, weight in vector.items()}
+
+
+def is_informative(documents, total):
+    """Терм из одного поста ни с чем не свяжет, слишком частый — шум."""
+    return 2 <= documents <= max(2, MAX_DOCUMENT_RATIO * total)
+
+
+def nearest(vector, postings, exclude, size=RELATED_SIZE):
+    """Ближайшие по косинусу посты через инвертированный индекс.
+
+    Складываются только произведения общих термов, то есть это строка
+    произведения разреженных матриц X·Xᵀ.
+    """
+    scores = defaultdict(float)
+    for term, weight in vector.items():
+        for other, other_weight in postings.get(term, ()):
+            scores[other] += weight * other_weight
+    scores.pop(exclude, None)
+    return heapq.nlargest(size, scores.items(), key=itemgetter(1))
+
+
+def _related_rows(post_id, neighbours):
+    return [
+        RelatedPost(post_id=post_id, related_id=other, score=score)
+        for other, score in neighbours
+    ]
+
+
+def rebuild_related(size=RELATED_SIZE):
+    """Пересчитывает похожие посты для всех постов; возвращает их число."""
+    counts = {
+        post_id: Counter(tokenize(text))
+        for post_id, text in Post.objects.values_list('id', 'text').order_by()
+    }
+    total = len(counts)
+    frequencies = Counter(term for terms in counts.values() for term in terms)
+    vectors = {
+        post_id: tfidf(terms, frequencies, total)
+        for post_id, terms in counts.items()
+    }
+    postings = defaultdict(list)
+    for post_id, vector in vectors.items():
+        for term, weight in vector.items():
+            if is_informative(frequencies[term], total):
+                postings[term].append((post_id, weight))
+    related = []
+    for post_id, vector in vectors.items():
+        related.extend(
+            _related_rows(post_id, nearest(vector, postings, post_id, size))
+        )
+    with transaction.atomic():
+        RelatedPost.objects.all().delete()
+        TermPosting.objects.all().delete()
+        TermFrequency.objects.all().delete()
+        TermFrequency.objects.bulk_create(
+            (TermFrequency(term=term, documents=documents)
+             for term, documents in frequencies.items()),
+            batch_size=SAVE_BATCH_SIZE,
+        )
+        TermPosting.objects.bulk_create(
+            (TermPosting(term=term, post_id=post_id, weight=weight)
+             for post_id, vector in vectors.items()
+             for term, weight in vector.items()),
+            batch_size=SAVE_BATCH_SIZE,
+        )
+        RelatedPost.objects.bulk_create(related, batch_size=SAVE_BATCH_SIZE)
+    return total
+
+
+def _count_terms(terms, delta):
+    """Сдвигает документные частоты термов, создавая недостающие."""
+    TermFrequency.objects.filter(term__in=terms).update(
+        documents=F('documents') + delta
+    )
+    if delta > 0:
+        known = set(TermFrequency.objects.filter(
+            term__in=terms
+        ).values_list('term', flat=True))
+        TermFrequency.objects.bulk_create(
+            TermFrequency(term=term, documents=delta)
+            for term in terms if term not in known
+        )
+
+
+def _accept_reciprocal(post_id, candidates, size):
+    """Добавляет новый пост в списки соседей, где он ближе прежних."""
+    current = defaultdict(list)
+    for row in RelatedPost.objects.filter(post_id__in=[
+        other for other, _ in candidates
+    ]).order_by('post_id', '-score'):
+        current[row.post_id].append(row)
+    for other, score in candidates:
+        rows = current[other]
+        if len(rows) >= size and rows[-1].score >= score:
+            continue
+        RelatedPost.objects.create(
+            post_id=other, related_id=post_id, score=score
+        )
+        RelatedPost.objects.filter(
+            pk__in=[row.pk for row in rows[size - 1:]]
+        ).delete()
+
+
+@transaction.atomic
+def update_related(post_id, size=RELATED_SIZE):
+    """Пересчитывает похожие для одного нового или изменённого поста.
+
+    Частоты термов и веса остальных постов берутся из прошлого
+    пересчёта, а из TermPosting читаются только строки термов этого
+    поста, поэтому стоимость зависит от длины их списков, а не от числа
+    постов. Веса старых векторов слегка устаревают до следующего полного
+    пересчёта.
+    """
+    post = Post.objects.filter(pk=post_id).first()
+    RelatedPost.objects.filter(
+        Q(post_id=post_id) | Q(related_id=post_id)
+    ).delete()
+    previous = TermPosting.objects.filter(post_id=post_id)
+    _count_terms(list(previous.values_list('term', flat=True)), -1)
+    previous.delete()
+    if post is None:
+        return
+    counts = Counter(tokenize(post.text))
+    _count_terms(list(counts), 1)
+    total = Post.objects.count()
+    frequencies = dict(
+        TermFrequency.objects.filter(term__in=counts)
+        .values_list('term', 'documents')
+    )
+    vector = tfidf(counts, frequencies, total)
+    TermPosting.objects.bulk_create(
+        TermPosting(term=term, post_id=post_id, weight=weight)
+        for term, weight in vector.items()
+    )
+    query = {
+        term: weight for term, weight in vector.items()
+        if is_informative(frequencies[term], total)
+    }
+    postings = defaultdict(list)
+    rows = TermPosting.objects.filter(term__in=query).exclude(
+        post_id=post_id
+    ).values_list('term', 'post_id', 'weight').order_by()
+    for term, other, weight in rows.iterator():
+        postings[term].append((other, weight))
+    candidates = nearest(query, postings, post_id, RECIPROCAL_CANDIDATES)
+    RelatedPost.objects.bulk_create(_related_rows(post_id, candidates[:size]))
+    _accept_reciprocal(post_id, candidates, size)
+
+
+def related_posts(post_id, size=RELATED_SIZE):
+    """Похожие посты одним запросом по индексу (post, -score)."""
+    return [
+        row.related for row in RelatedPost.objects.filter(
+            post_id=post_id
+        ).select_related('related__author').order_by('-score')[:size]
+    ]
@@ -0,0 +1,79 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .feeds import (GLOBAL_FEED, author_feed, group_feed, invalidate_feeds,
+                    invalidate_post)
+from .groups import group_registry
+from .models import Group, Post
+from .recent import drop_recent
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_registry(sender, **kwargs):
+    """Сбрасывает реестр групп сразу и ещё раз после коммита.
+
+    Та же гонка, что в drop_feeds_on_commit: до коммита другой воркер
+    может перечитать старые группы уже под новой версией.
+    """
+    group_registry.invalidate()
+    transaction.on_commit(group_registry.invalidate)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_group(sender, instance, **kwargs):
+    instance._previous_group_id = None
+    if instance.pk is not None:
+        instance._previous_group_id = (
+            Post.objects.filter(pk=instance.pk)
+            .values_list('group_id', flat=True).first()
+        )
+
+
+def post_feeds(post, group_id):
+    feeds = [author_feed(post.author_id)]
+    if group_id:
+        feeds.append(group_feed(group_id))
+    return feeds
+
+
+def drop_feeds_on_commit(post_id, feeds, global_feed=False):
+    """Сбрасывает кеш поста и лент сразу и ещё раз после коммита.
+
+    Между этими сбросами параллельный запрос мог прочитать базу без
+    изменений и закешировать её; второй сброс это убирает. Кеш только
+    сбрасывается, поэтому откат транзакции не оставляет в нём следов.
+    """
+    def drop():
+        invalidate_post(post_id)
+        drop_recent(*feeds)
+        if global_feed:
+            invalidate_feeds(GLOBAL_FEED)
+    drop()
+    transaction.on_commit(drop)
+
+
+@receiver(post_save, sender=Post)
+def update_post_feeds(sender, instance, created, **kwargs):
+    """Правка текста сбрасывает только сам пост, а не списки лент."""
+    previous_group_id = getattr(instance, '_previous_group_id', None)
+    if created:
+        feeds = post_feeds(instance, instance.group_id)
+    elif previous_group_id != instance.group_id:
+        feeds = [
+            group_feed(group_id)
+            for group_id in (previous_group_id, instance.group_id)
+            if group_id
+        ]
+    else:
+        feeds = []
+    drop_feeds_on_commit(instance.pk, feeds, global_feed=created)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_feeds(sender, instance, **kwargs):
+    drop_feeds_on_commit(
+        instance.pk, post_feeds(instance, instance.group_id),
+        global_feed=True
+    )
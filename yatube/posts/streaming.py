@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template
+
+from .reactions import reaction_summary, set_reaction_counts
+
+FEED_POST_TEMPLATE = 'posts/includes/feed_post.html'
+FEED_BOTTOM_TEMPLATE = 'posts/stream/bottom.html'
+
+
+def wants_streaming(request):
+    """Включён ли потоковый рендер ленты для запроса."""
+    return settings.STREAMING_FEEDS or request.GET.get('stream') == '1'
+
+
+def _page_posts(paginator, page_number, user):
+    try:
+        number = max(int(page_number), 1)
+    except (TypeError, ValueError):
+        number = 1
+    offset = (number - 1) * paginator.per_page
+    posts = paginator.object_list[offset:offset + paginator.per_page]
+    # счётчики реакций страницы — заранее, по одним id: сами посты
+    # дальше читаются курсором и рендерятся по мере получения
+    summary = reaction_summary(
+        list(posts.values_list('pk', flat=True)), user
+    )
+    for post in posts.iterator():
+        yield set_reaction_counts(post, *summary.get(post.pk, ({}, None)))
+
+
+def stream_feed(request, top_template, paginator, context):
+    """Отдаёт ленту частями по мере чтения постов из базы.
+
+    Шапка страницы уходит клиенту до запроса постов, карточки
+    рендерятся по одной, пагинатор (и COUNT) — в самом конце.
+    """
+    page_number = request.GET.get('page')
+
+    def render():
+        yield get_template(top_template).render(context, request)
+        post_template = get_template(FEED_POST_TEMPLATE)
+        posts = _page_posts(paginator, page_number, request.user)
+        for position, post in enumerate(posts):
+            if position:
+                yield '<hr>'
+            # с request: формы реакций и CSRF-токен для вошедших
+            yield post_template.render({**context, 'post': post}, request)
+        page_obj = paginator.get_page(page_number)
+        yield get_template(FEED_BOTTOM_TEMPLATE).render(
+            {**context, 'page_obj': page_obj}, request
+        )
+
+    return StreamingHttpResponse(render())
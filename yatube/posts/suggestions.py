@@ -0,0 +1,111 @@
+import heapq
+from array import array
+from collections import Counter
+from itertools import accumulate
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Follow, FollowSuggestion
+
+SUGGESTIONS_SIZE: int = 10
+SAVE_BATCH_SIZE: int = 1000
+
+
+class FollowGraph:
+    """Граф подписок в сжатом виде (CSR) на двух массивах array.
+
+    Пользователи перенумерованы подряд; подписки узла i — это
+    targets[offsets[i]:offsets[i + 1]], а ids[i] — id пользователя.
+    На ребро уходит около 5 байт вместо ~80 у словаря множеств.
+    """
+
+    def __init__(self, edges):
+        index = {}
+        sources = array('i')
+        targets = array('i')
+        for user_id, author_id in edges:
+            sources.append(index.setdefault(user_id, len(index)))
+            targets.append(index.setdefault(author_id, len(index)))
+        degrees = array('q', bytes(8 * len(index)))
+        for source in sources:
+            degrees[source] += 1
+        self.ids = array('q', index)
+        self.offsets = array('q', [0]) + array('q', accumulate(degrees))
+        self.targets = array('i', bytes(4 * len(targets)))
+        position = array('q', self.offsets)
+        for source, target in zip(sources, targets):
+            self.targets[position[source]] = target
+            position[source] += 1
+
+    def __len__(self):
+        return len(self.ids)
+
+    def following(self, node):
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def friends_of_friends(self, node, size=SUGGESTIONS_SIZE):
+        """Авторы, которых читают подписки узла, по числу таких подписок."""
+        followed = self.following(node)
+        mutual = Counter()
+        for friend in followed:
+            mutual.update(self.following(friend))
+        for known in followed:
+            mutual.pop(known, None)
+        mutual.pop(node, None)
+        return heapq.nlargest(size, mutual.items(), key=itemgetter(1))
+
+    def suggestions(self, size=SUGGESTIONS_SIZE):
+        """Пары (id пользователя, id автора, общих подписок)."""
+        for node in range(len(self)):
+            for candidate, mutual in self.friends_of_friends(node, size):
+                yield self.ids[node], self.ids[candidate], mutual
+
+
+def rebuild_suggestions(size=SUGGESTIONS_SIZE):
+    """Пересчитывает рекомендации всем; возвращает число рекомендаций."""
+    graph = FollowGraph(
+        Follow.objects.values_list('user_id', 'author_id').order_by()
+        .iterator()
+    )
+    rows = [
+        FollowSuggestion(user_id=user_id, author_id=author_id, mutual=mutual)
+        for user_id, author_id, mutual in graph.suggestions(size)
+    ]
+    with transaction.atomic():
+        FollowSuggestion.objects.all().delete()
+        FollowSuggestion.objects.bulk_create(rows, batch_size=SAVE_BATCH_SIZE)
+    return len(rows)
+
+
+@transaction.atomic
+def update_suggestions(user_id, size=SUGGESTIONS_SIZE):
+    """Пересчитывает рекомендации одного пользователя после (от)писки.
+
+    Друзья друзей считаются одним запросом с группировкой по индексу
+    подписок. Рекомендации тех, кто читает пользователя, обновит
+    следующий полный пересчёт.
+    """
+    followed = Follow.objects.filter(user_id=user_id).values('author_id')
+    mutual = Follow.objects.filter(user_id__in=followed).exclude(
+        author_id__in=followed
+    ).exclude(author_id=user_id).values('author_id').annotate(
+        mutual=Count('id')
+    ).order_by('-mutual', 'author_id')[:size]
+    FollowSuggestion.objects.filter(user_id=user_id).delete()
+    FollowSuggestion.objects.bulk_create(
+        FollowSuggestion(
+            user_id=user_id, author_id=row['author_id'], mutual=row['mutual']
+        )
+        for row in mutual
+    )
+
+
+def follow_suggestions(user, size=SUGGESTIONS_SIZE):
+    """Кого почитать: один запрос по индексу (user, -mutual)."""
+    if not user.is_authenticated:
+        return []
+    return list(FollowSuggestion.objects.filter(user=user).select_related(
+        'author'
+    ).order_by('-mutual')[:size])
@@ -0,0 +1,34 @@
+from sorl.thumbnail import get_thumbnail
+
+from core.tasks import task
+
+from .models import Post
+from .related import update_related
+from .suggestions import update_suggestions
+
+# те же параметры, что у {% thumbnail %} в шаблонах постов
+POST_THUMBNAIL_GEOMETRY = '960x339'
+POST_THUMBNAIL_OPTIONS = {'crop': 'center', 'upscale': True}
+
+
+@task()
+def make_post_thumbnail(post_id):
+    """Готовит миниатюру картинки поста до первого показа."""
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None or not post.image:
+        return
+    get_thumbnail(
+        post.image, POST_THUMBNAIL_GEOMETRY, **POST_THUMBNAIL_OPTIONS
+    )
+
+
+@task()
+def update_related_posts(post_id):
+    """Обновляет похожие записи нового или изменённого поста."""
+    update_related(post_id)
+
+
+@task()
+def update_follow_suggestions(user_id):
+    """Обновляет рекомендации подписок пользователя."""
+    update_suggestions(user_id)
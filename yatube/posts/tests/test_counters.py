@@ -0,0 +1,109 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from posts.counters import ViewCounter, view_counter
+from posts.models import Post
+
+User = get_user_model()
+
+
+class ViewCounterTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.posts = [
+            Post.objects.create(author=cls.author, text=f'Пост {i}')
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.counter = ViewCounter(flush_interval=60, shards=4)
+
+    def views(self, post):
+        post.refresh_from_db(fields=['views'])
+        return post.views
+
+    def test_views_buffered_until_flush(self):
+        first, second, third = self.posts
+        for post in (first, first, second, third):
+            self.counter.add(post.pk)
+        self.assertEqual(self.counter.pending(first.pk), 2)
+        self.assertEqual(self.views(first), 0)
+        self.assertEqual(self.counter.flush(), 3)
+        self.assertEqual(
+            [self.views(post) for post in self.posts], [2, 1, 1]
+        )
+        self.assertEqual(self.counter.pending(first.pk), 0)
+        self.assertEqual(self.counter.flush(), 0)
+
+    def test_concurrent_adds_not_lost(self):
+        post = self.posts[0]
+
+        def view():
+            for _ in range(1000):
+                self.counter.add(post.pk)
+        threads = [threading.Thread(target=view) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.counter.pending(post.pk), 8000)
+
+    def test_failed_flush_keeps_deltas(self):
+        post = self.posts[0]
+        self.counter.add(post.pk, 5)
+        with mock.patch('posts.counters.transaction.atomic',
+                        side_effect=DatabaseError):
+            self.assertEqual(self.counter.flush(), 0)
+        self.assertEqual(self.counter.pending(post.pk), 5)
+
+    def test_add_does_not_flush(self):
+        """Запрос только копит просмотр, пишет фоновый поток."""
+        counter = ViewCounter(flush_interval=0)
+        with self.assertNumQueries(0):
+            counter.add(self.posts[0].pk)
+        self.assertEqual(counter.pending(self.posts[0].pk), 1)
+
+    def test_fork_resets_child_state(self):
+        """Ребёнок не наследует чужие просмотры и захваченные замки."""
+        post = self.posts[0]
+        self.counter.add(post.pk, 2)
+        self.counter.flush_lock.acquire()
+        with mock.patch.object(self.counter, '_restart'):
+            self.counter._after_fork()
+        self.assertEqual(self.counter.pending(post.pk), 0)
+        self.assertTrue(self.counter.flush_lock.acquire(blocking=False))
+
+    def test_post_detail_shows_views(self):
+        post = self.posts[1]
+        view_counter.flush()
+        url = reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        Client().get(url)
+        response = Client().get(url)
+        self.assertEqual(response.context['views'], 2)
+
+
+class ViewCounterThreadTests(TransactionTestCase):
+    def test_idle_views_flushed_by_thread(self):
+        """Просмотры пишутся в базу и без следующих запросов."""
+        author = User.objects.create_user(username='auth')
+        post = Post.objects.create(author=author, text='Пост')
+        counter = ViewCounter(flush_interval=0.05)
+        counter.start()
+        self.addCleanup(counter.stop)
+        counter.add(post.pk, 3)
+        deadline = time.monotonic() + 2
+        post.refresh_from_db(fields=['views'])
+        while not post.views and time.monotonic() < deadline:
+            time.sleep(0.01)
+            post.refresh_from_db(fields=['views'])
+        self.assertEqual(post.views, 3)
+        counter.stop()
+        self.assertFalse(counter.thread.is_alive())
@@ -0,0 +1,108 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.paginator import EstimatedCount
+from posts.feeds import (GLOBAL_FEED, feed_ids_key, feed_paginator,
+                         hydrate_posts)
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.group_2 = Group.objects.create(
+            title='Тестовая группа 2',
+            slug='test-slug-2',
+            description='Тестовое описание',
+        )
+        for i in range(12):
+            Post.objects.create(
+                author=cls.author, group=cls.group, text=f'Пост {i}'
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_page_hydrated_from_cache(self):
+        """Повторная страница ленты не обращается к базе."""
+        posts = Post.objects.select_related('author')
+        with self.assertNumQueries(2):
+            page = feed_paginator(GLOBAL_FEED, posts, 10).page(1)
+        self.assertEqual(page[0].text, 'Пост 11')
+        with self.assertNumQueries(0):
+            page = feed_paginator(GLOBAL_FEED, posts, 10).page(1)
+            self.assertEqual(page[0].author.username, 'auth')
+
+    def test_only_misses_are_loaded(self):
+        """Из базы загружаются только посты, которых нет в кеше."""
+        ids = list(Post.objects.values_list('id', flat=True))
+        hydrate_posts(ids[:5])
+        with self.assertNumQueries(1):
+            posts = hydrate_posts(ids)
+        self.assertEqual([post.id for post in posts], ids)
+
+    def test_edit_invalidates_only_post(self):
+        """Правка текста сбрасывает пост, но не список id ленты."""
+        posts = Post.objects.all()
+        feed_paginator(GLOBAL_FEED, posts, 10).page(1)
+        post = Post.objects.first()
+        post.text = 'Изменённый текст'
+        post.save()
+        self.assertIsNotNone(cache.get(feed_ids_key(GLOBAL_FEED)))
+        page = feed_paginator(GLOBAL_FEED, posts, 10).page(1)
+        self.assertEqual(page[0].text, 'Изменённый текст')
+
+    def test_new_post_updates_feed(self):
+        """Новый пост сбрасывает список id общей ленты."""
+        posts = Post.objects.all()
+        feed_paginator(GLOBAL_FEED, posts, 10).page(1)
+        post = Post.objects.create(
+            author=self.author, group=self.group, text='Новый пост'
+        )
+        paginator = feed_paginator(GLOBAL_FEED, posts, 10)
+        self.assertEqual(paginator.page(1)[0], post)
+        self.assertEqual(paginator.count, 13)
+
+    def test_deleted_post_skipped(self):
+        """Удалённый пост пропадает из ленты."""
+        posts = Post.objects.all()
+        feed_paginator(GLOBAL_FEED, posts, 10).page(1)
+        Post.objects.first().delete()
+        self.assertEqual(feed_paginator(GLOBAL_FEED, posts, 10).count, 11)
+
+    def test_cached_ids_are_bounded(self):
+        """В кеше только начало ленты, дальние страницы идут запросом."""
+        posts = Post.objects.all()
+        with mock.patch('posts.feeds.FEED_IDS_LIMIT', 5):
+            paginator = feed_paginator(GLOBAL_FEED, posts, 5)
+        self.assertEqual(len(cache.get(feed_ids_key(GLOBAL_FEED))['ids']), 5)
+        self.assertEqual(paginator.count, 12)
+        with self.assertNumQueries(1):
+            first = paginator.page(1)
+        self.assertEqual(first[0].text, 'Пост 11')
+        with self.assertNumQueries(1):
+            last = list(paginator.page(3))
+        self.assertEqual([post.text for post in last], ['Пост 1', 'Пост 0'])
+
+    def test_large_feed_total_is_estimated(self):
+        """Для большой ленты общее число берётся без COUNT(*)."""
+        posts = Post.objects.all()
+        with mock.patch('posts.feeds.FEED_IDS_LIMIT', 5), \
+                mock.patch('core.counting.table_row_estimate',
+                           return_value=50000), \
+                self.assertNumQueries(1):
+            paginator = feed_paginator(GLOBAL_FEED, posts, 5)
+        self.assertIsInstance(paginator.count, EstimatedCount)
+        self.assertEqual(paginator.count, 50000)
@@ -3,6 +3,8 @@ import tempfile
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from core.models import Task
+from core.tasks import run_tasks
 from posts.forms import PostForm
 from posts.models import Post, Comment
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -171,6 +173,13 @@ class PostCreateFormTests(TestCase):
         self.assertEqual(Post.objects.count(), post_count + 1)
         self.assertEqual(Post.objects.get(author=self.user).text,
                          form_data['text'])
+        self.assertEqual(
+            set(Task.objects.values_list('name', flat=True)),
+            {'posts.tasks.make_post_thumbnail',
+             'posts.tasks.update_related_posts'}
+        )
+        self.assertEqual(run_tasks(), 2)
+        self.assertFalse(Task.objects.exists())
 
     def test_comments_by_authorized_client(self):
         """Комментировать посты может авторизованный пользователь.
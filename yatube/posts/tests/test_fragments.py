@@ -0,0 +1,107 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.templatetags.pagination import next_cursor
+from posts.models import Follow, Group, Post, Reaction
+from posts.reactions import toggle_reaction
+
+User = get_user_model()
+
+
+class FeedFragmentTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(25):
+            Post.objects.create(
+                author=cls.author, group=cls.group, text=f'Пост номер {i}'
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=self.reader, author=self.author)
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.reader)
+
+    def collect_feed(self, url):
+        """Проходит ленту фрагментами и возвращает тексты постов."""
+        page_obj = self.authorized_client.get(url).context['page_obj']
+        texts = [post.text for post in page_obj]
+        cursor = next_cursor(page_obj)
+        while cursor:
+            data = self.authorized_client.get(
+                url, {'fragment': 1, 'cursor': cursor}
+            ).json()
+            texts += re.findall(r'<p>(.*?)</p>', data['html'])
+            cursor = data['next']
+        return texts
+
+    def test_fragments_walk_whole_feed(self):
+        """Фрагменты продолжают ленту без пропусков и повторов."""
+        expected = [f'Пост номер {i}' for i in reversed(range(25))]
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:follow_index'),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.collect_feed(url), expected)
+
+    def test_first_fragment_without_cursor(self):
+        """Без курсора фрагмент начинается с первого поста."""
+        data = self.authorized_client.get(
+            reverse('posts:index'), {'fragment': 1}
+        ).json()
+        self.assertIn('Пост номер 24</p>', data['html'])
+        self.assertEqual(data['html'].count('<hr>'), 9)
+        self.assertTrue(data['next'])
+
+    def test_fragment_cache_headers(self):
+        """Фрагменты общей ленты для гостя публичные, остальные — приватные."""
+        group_url = reverse(
+            'posts:group_list', kwargs={'slug': self.group.slug}
+        )
+        response = Client().get(group_url, {'fragment': 1})
+        self.assertEqual(response['Cache-Control'], 'max-age=20, public')
+        response = self.authorized_client.get(group_url, {'fragment': 1})
+        self.assertEqual(response['Cache-Control'], 'max-age=20, private')
+        response = self.authorized_client.get(
+            reverse('posts:follow_index'), {'fragment': 1}
+        )
+        self.assertEqual(response['Cache-Control'], 'max-age=20, private')
+
+    def test_fragment_cards_have_user_reactions(self):
+        """Во фрагментах вошедший видит формы реакций и свою отметку."""
+        toggle_reaction(self.reader, Post.objects.first().pk, Reaction.LIKE)
+        cache.clear()
+        data = self.authorized_client.get(
+            reverse('posts:index'), {'fragment': 1}
+        ).json()
+        self.assertEqual(
+            data['html'].count('method="post"'), 10 * len(Reaction.KINDS)
+        )
+        self.assertEqual(data['html'].count('btn-sm btn-primary'), 1)
+        self.assertIn('name="next" value="/"', data['html'])
+        self.assertIn('csrfmiddlewaretoken', data['html'])
+        guest = Client().get(reverse('posts:index'), {'fragment': 1}).json()
+        self.assertNotIn('method="post"', guest['html'])
+        self.assertNotIn('csrfmiddlewaretoken', guest['html'])
+
+    def test_invalid_cursor(self):
+        """Неверный курсор возвращает 400."""
+        response = self.authorized_client.get(
+            reverse('posts:index'), {'fragment': 1, 'cursor': '!!!'}
+        )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from posts.groups import GROUP_REGISTRY_VERSION_KEY, group_registry
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class GroupRegistryTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, group=cls.group, text=f'Пост {i}')
+            for i in range(3)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_lookups_without_queries(self):
+        """После загрузки группы берутся из памяти процесса."""
+        group_registry.refresh()
+        with self.assertNumQueries(0):
+            by_slug = group_registry.get(slug='test-slug')
+            by_id = group_registry.get(pk=self.group.pk)
+        self.assertIs(by_slug, by_id)
+
+    def test_post_group_from_registry(self):
+        """post.group не делает запросов к базе."""
+        posts = list(Post.objects.all())
+        group_registry.refresh()
+        with self.assertNumQueries(0):
+            titles = {post.group.title for post in posts}
+        self.assertEqual(titles, {'Тестовая группа'})
+
+    def test_invalidated_on_save_and_delete(self):
+        """Изменение и удаление группы видно сразу."""
+        group_registry.refresh()
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = 'Новое название'
+        group.save()
+        self.assertEqual(
+            group_registry.get(slug='test-slug').title, 'Новое название'
+        )
+        group.delete()
+        self.assertIsNone(group_registry.get(slug='test-slug'))
+
+    def test_new_group_found_before_invalidation(self):
+        """Группа, о которой реестр ещё не знает, ищется в базе."""
+        group_registry.refresh()
+        Group.objects.bulk_create([
+            Group(title='Новая', slug='new-slug', description='Описание')
+        ])
+        self.assertEqual(group_registry.get(slug='new-slug').title, 'Новая')
+
+    def test_group_page_uses_registry(self):
+        """Страница группы не запрашивает группу из базы."""
+        url = reverse('posts:group_list', kwargs={'slug': 'test-slug'})
+        group_registry.refresh()
+        with self.assertNumQueries(3):
+            # посты с авторами, их количество и реакции на них
+            response = self.guest_client.get(url)
+        self.assertEqual(response.context['group'].title, 'Тестовая группа')
+        response = self.guest_client.get(
+            reverse('posts:group_list', kwargs={'slug': 'missing'})
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class GroupRegistryCommitTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidated_again_after_commit(self):
+        """Реестр, перечитанный до коммита, сбрасывается после него."""
+        with transaction.atomic():
+            Group.objects.create(title='Новая', slug='new-slug')
+            version = cache.get(GROUP_REGISTRY_VERSION_KEY)
+        self.assertIsNotNone(version)
+        self.assertNotEqual(cache.get(GROUP_REGISTRY_VERSION_KEY), version)
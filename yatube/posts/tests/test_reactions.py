@@ -0,0 +1,140 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, Reaction, ReactionCounter
+from posts.reactions import reaction_summary, toggle_reaction
+
+User = get_user_model()
+
+
+class ReactionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.posts = [
+            Post.objects.create(author=cls.author, text=f'Пост {i}')
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def test_toggle_and_change(self):
+        post = self.posts[0]
+        self.assertEqual(
+            toggle_reaction(self.reader, post.pk, Reaction.LIKE),
+            Reaction.LIKE
+        )
+        self.assertEqual(
+            toggle_reaction(self.reader, post.pk, Reaction.LOVE),
+            Reaction.LOVE
+        )
+        self.assertEqual(Reaction.objects.get().kind, Reaction.LOVE)
+        self.assertEqual(reaction_summary([post.pk], self.reader)[post.pk],
+                         ({Reaction.LOVE: 1}, Reaction.LOVE))
+        self.assertIsNone(
+            toggle_reaction(self.reader, post.pk, Reaction.LOVE)
+        )
+        self.assertFalse(Reaction.objects.exists())
+        self.assertEqual(reaction_summary([post.pk])[post.pk], ({}, None))
+
+    def test_counts_merged_across_shards(self):
+        post = self.posts[1]
+        users = [
+            User.objects.create_user(username=f'user{i}') for i in range(20)
+        ]
+        for user in users:
+            toggle_reaction(user, post.pk, Reaction.LIKE)
+        toggle_reaction(users[0], post.pk, Reaction.LIKE)
+        self.assertGreater(ReactionCounter.objects.count(), 1)
+        counts, mine = reaction_summary([post.pk], users[1])[post.pk]
+        self.assertEqual(counts, {Reaction.LIKE: 19})
+        self.assertEqual(mine, Reaction.LIKE)
+
+    def test_page_summary_in_one_query(self):
+        """Счётчики и отметки пользователя для страницы — один запрос."""
+        for post in self.posts:
+            toggle_reaction(self.author, post.pk, Reaction.LAUGH)
+        toggle_reaction(self.reader, self.posts[2].pk, Reaction.LIKE)
+        with self.assertNumQueries(1):
+            summary = reaction_summary(
+                [post.pk for post in self.posts], self.reader
+            )
+        self.assertEqual(summary[self.posts[2].pk], (
+            {Reaction.LAUGH: 1, Reaction.LIKE: 1}, Reaction.LIKE
+        ))
+        self.assertEqual(summary[self.posts[0].pk],
+                         ({Reaction.LAUGH: 1}, None))
+
+    def test_react_view(self):
+        post = self.posts[0]
+        url = reverse('posts:post_react', kwargs={
+            'post_id': post.pk, 'kind': Reaction.LIKE
+        })
+        index = reverse('posts:index')
+        response = self.client.post(url, {'next': index})
+        self.assertRedirects(response, index)
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        )
+        like = response.context['post'].reaction_counts[0]
+        self.assertEqual((like['count'], like['mine']), (1, True))
+        response = self.client.post(url, {'next': 'https://evil.example/'})
+        self.assertRedirects(
+            response,
+            reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        )
+        self.assertFalse(Reaction.objects.exists())
+
+    def test_unknown_kind_ignored(self):
+        url = reverse('posts:post_react', kwargs={
+            'post_id': self.posts[0].pk, 'kind': 'angry'
+        })
+        self.client.post(url)
+        self.assertFalse(Reaction.objects.exists())
+
+    def test_cached_index_is_per_user(self):
+        """Кеш главной не отдаёт одному пользователю реакции и CSRF другого."""
+        cache.clear()
+        toggle_reaction(self.reader, self.posts[0].pk, Reaction.LIKE)
+        self.client.get(reverse('posts:index'))
+        other = Client(enforce_csrf_checks=True)
+        other.force_login(self.author)
+        other.get(reverse('posts:index'))
+        response = other.get(reverse('posts:index'))
+        self.assertNotContains(response, 'btn-sm btn-primary')
+        token = re.search(
+            r'name="csrfmiddlewaretoken" value="([^"]+)"',
+            response.content.decode()
+        ).group(1)
+        response = other.post(
+            reverse('posts:post_react',
+                    args=[self.posts[0].pk, Reaction.LIKE]),
+            {'csrfmiddlewaretoken': token}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            reaction_summary([self.posts[0].pk])[self.posts[0].pk][0],
+            {Reaction.LIKE: 2}
+        )
+
+    def test_index_shows_own_reaction_after_react(self):
+        """После реакции редирект на главную не отдаёт её старую копию."""
+        cache.clear()
+        post = self.posts[0]
+        response = self.client.get(reverse('posts:index'))
+        self.assertNotContains(response, 'btn-sm btn-primary')
+        response = self.client.post(
+            reverse('posts:post_react', args=[post.pk, Reaction.LIKE]),
+            {'next': reverse('posts:index')},
+            follow=True,
+        )
+        self.assertContains(response, 'btn-sm btn-primary', count=1)
+        self.assertContains(response, '👍 1')
@@ -0,0 +1,127 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+
+from core.paginator import EstimatedCount
+from posts.feeds import author_feed, group_feed, hydrate_posts
+from posts.models import Group, Post
+from posts.recent import (RECENT_BUFFER_SIZE, RecentFeedPaginator,
+                          recent_entry, recent_hit_rate, recent_key)
+
+User = get_user_model()
+
+
+class RecentBufferTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.group_2 = Group.objects.create(
+            title='Тестовая группа 2',
+            slug='test-slug-2',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create([
+            Post(author=cls.author, group=cls.group, text=f'Пост {i}')
+            for i in range(RECENT_BUFFER_SIZE + 5)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.posts = self.group.group.all()
+        self.feed = group_feed(self.group.pk)
+
+    def test_first_pages_from_buffer(self):
+        """Страницы внутри буфера не обращаются к базе."""
+        recent_entry(self.feed, self.posts)
+        hydrate_posts(list(self.posts.values_list('id', flat=True)[:10]))
+        with self.assertNumQueries(0):
+            page = RecentFeedPaginator(self.feed, self.posts, 10).page(1)
+            self.assertEqual(len(page), 10)
+            self.assertEqual(page[0].author.username, 'auth')
+        self.assertEqual(recent_hit_rate()['hits'], 1)
+
+    def test_far_pages_from_database(self):
+        """Страницы за пределами буфера читаются запросом."""
+        paginator = RecentFeedPaginator(self.feed, self.posts, 10)
+        last_page = paginator.num_pages
+        self.assertEqual(paginator.count, RECENT_BUFFER_SIZE + 5)
+        page = paginator.page(last_page)
+        self.assertEqual(list(page), list(self.posts[(last_page - 1) * 10:]))
+        self.assertEqual(recent_hit_rate()['misses'], 1)
+
+    def test_new_post_drops_buffers(self):
+        """Новый пост сбрасывает буферы, следующее чтение их строит."""
+        recent_entry(self.feed, self.posts)
+        recent_entry(author_feed(self.author.pk), self.author.posts.all())
+        post = Post.objects.create(
+            author=self.author, group=self.group, text='Новый пост'
+        )
+        self.assertIsNone(cache.get(recent_key(self.feed)))
+        self.assertIsNone(
+            cache.get(recent_key(author_feed(self.author.pk)))
+        )
+        entry = recent_entry(self.feed, self.posts)
+        self.assertEqual(entry['ids'][0], post.pk)
+        self.assertEqual(len(entry['ids']), RECENT_BUFFER_SIZE)
+        self.assertEqual(entry['total'], RECENT_BUFFER_SIZE + 6)
+
+    def test_deleted_post_removed_from_buffer(self):
+        """Удалённый пост сбрасывает буфер и пропадает из ленты."""
+        recent_entry(self.feed, self.posts)
+        self.posts.first().delete()
+        self.assertIsNone(cache.get(recent_key(self.feed)))
+        paginator = RecentFeedPaginator(self.feed, self.posts, 10)
+        self.assertEqual(paginator.count, RECENT_BUFFER_SIZE + 4)
+        self.assertEqual(list(paginator.page(1)), list(self.posts[:10]))
+
+    def test_group_change_drops_buffers(self):
+        """Смена группы поста сбрасывает буферы обеих групп."""
+        recent_entry(self.feed, self.posts)
+        post = self.posts.first()
+        post.group = self.group_2
+        post.save()
+        self.assertIsNone(cache.get(recent_key(self.feed)))
+        paginator = RecentFeedPaginator(self.feed, self.posts, 10)
+        self.assertEqual(paginator.count, RECENT_BUFFER_SIZE + 4)
+
+    def test_full_buffer_total_is_estimated(self):
+        """Полный буфер не запускает точный COUNT(*) по всей ленте."""
+        with mock.patch('posts.recent.RECENT_BUFFER_SIZE', 2), \
+                mock.patch('core.counting.table_row_estimate',
+                           return_value=50000), \
+                self.assertNumQueries(1):
+            entry = recent_entry('all', Post.objects.all())
+        self.assertIsInstance(entry['total'], EstimatedCount)
+
+    def test_stats_command(self):
+        RecentFeedPaginator(self.feed, self.posts, 10).page(1)
+        out = StringIO()
+        call_command('feed_stats', stdout=out)
+        self.assertIn('попаданий 1', out.getvalue())
+
+
+class RecentBufferCommitTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='auth')
+        self.feed = author_feed(self.author.pk)
+
+    def test_buffer_dropped_again_after_commit(self):
+        """Буфер, закешированный до коммита, сбрасывается после него."""
+        with transaction.atomic():
+            Post.objects.create(author=self.author, text='Новый пост')
+            cache.set(recent_key(self.feed), {'ids': [], 'total': 0})
+        self.assertIsNone(cache.get(recent_key(self.feed)))
+        entry = recent_entry(self.feed, self.author.posts.all())
+        self.assertEqual(entry['total'], 1)
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Post, RelatedPost, TermPosting
+from posts.related import (rebuild_related, related_posts, tokenize,
+                           update_related)
+
+User = get_user_model()
+
+
+class RelatedPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        texts = [
+            'Кошки любят спать на тёплом подоконнике',
+            'Мои кошки спят на подоконнике весь день',
+            'Рецепт борща со свёклой и капустой',
+            'Борщ без свёклы не борщ, а капустный суп',
+            'Поезд опоздал на вокзал',
+        ]
+        cls.posts = [
+            Post.objects.create(author=cls.author, text=text)
+            for text in texts
+        ]
+        rebuild_related()
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_tokenize_drops_short_and_stop_words(self):
+        self.assertEqual(
+            tokenize('Это кошки, и 42 подоконника!'), ['кошки', 'подоко']
+        )
+
+    def test_rebuild_finds_similar_text(self):
+        cats, _, borsch, _, train = self.posts
+        self.assertEqual(related_posts(cats.pk)[0], self.posts[1])
+        self.assertEqual(related_posts(borsch.pk)[0], self.posts[3])
+        self.assertEqual(related_posts(train.pk), [])
+        self.assertNotIn(cats, related_posts(cats.pk))
+
+    def test_incremental_update_of_new_post(self):
+        """Новый пост получает соседей и попадает в их списки."""
+        post = Post.objects.create(
+            author=self.author, text='Сварил борщ, свёкла и капуста с рынка'
+        )
+        update_related(post.pk)
+        self.assertIn(self.posts[2], related_posts(post.pk))
+        self.assertIn(post, related_posts(self.posts[2].pk))
+        self.assertTrue(TermPosting.objects.filter(post=post).exists())
+
+    def test_edited_post_leaves_old_neighbours(self):
+        cats = self.posts[0]
+        Post.objects.filter(pk=cats.pk).update(text='Борщ и капуста')
+        update_related(cats.pk)
+        self.assertNotIn(cats, related_posts(self.posts[1].pk))
+        self.assertIn(self.posts[3], related_posts(cats.pk))
+
+    def test_deleted_post_cleans_up(self):
+        cats_id = self.posts[0].pk
+        Post.objects.filter(pk=cats_id).delete()
+        update_related(cats_id)
+        self.assertFalse(RelatedPost.objects.filter(related_id=cats_id))
+        self.assertFalse(TermPosting.objects.filter(post_id=cats_id))
+
+    def test_update_reads_only_own_terms(self):
+        """Инкрементальный пересчёт не читает индекс целиком."""
+        post = Post.objects.create(author=self.author, text='Борщ с капустой')
+        with CaptureQueriesContext(connection) as queries:
+            update_related(post.pk)
+        reads = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'posts_termposting' in query['sql']
+        ]
+        self.assertTrue(reads)
+        for sql in reads:
+            self.assertIn('WHERE', sql)
+        self.assertEqual(
+            sorted(TermPosting.objects.filter(post=post).values_list(
+                'term', flat=True
+            )),
+            ['борщ', 'капуст'],
+        )
+
+    def test_related_lookup_is_one_query(self):
+        with self.assertNumQueries(1):
+            related = related_posts(self.posts[0].pk)
+            related[0].author.username
+
+    def test_post_detail_shows_related(self):
+        response = self.client.get(
+            reverse('posts:post_detail', args=[self.posts[0].pk])
+        )
+        self.assertEqual(response.context['related'][0], self.posts[1])
+        self.assertContains(response, 'Похожие записи')
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.counting import EstimatedCountPaginator
+from posts.models import Group, Post, Reaction
+from posts.reactions import toggle_reaction
+from posts.streaming import _page_posts
+
+User = get_user_model()
+
+
+class StreamingFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, group=cls.group, text=f'Пост {i}')
+            for i in range(13)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(User.objects.create_user('reader'))
+
+    def feed_urls(self):
+        return (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+        )
+
+    def test_streaming_feed_pages(self):
+        """Потоковая лента содержит шапку, посты и пагинатор."""
+        for url in self.feed_urls():
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url, {'stream': 1})
+                self.assertTrue(response.streaming)
+                chunks = [chunk.decode() for chunk in response]
+                self.assertIn('<head>', chunks[0])
+                self.assertNotIn('Пост', chunks[0])
+                page = ''.join(chunks)
+                self.assertEqual(page.count('<hr>'), 9)
+                self.assertIn('?page=2', page)
+                self.assertTrue(page.rstrip().endswith('</html>'))
+
+    def test_streaming_second_page(self):
+        """Вторая страница потоковой ленты содержит оставшиеся посты."""
+        response = self.guest_client.get(
+            reverse('posts:index'), {'stream': 1, 'page': 2}
+        )
+        page = b''.join(response.streaming_content).decode()
+        self.assertEqual(page.count('Подробнее'), 3)
+
+    @override_settings(STREAMING_FEEDS=True)
+    def test_streaming_setting(self):
+        """Настройка STREAMING_FEEDS включает потоковый рендер."""
+        for url in self.feed_urls():
+            with self.subTest(url=url):
+                self.assertTrue(self.guest_client.get(url).streaming)
+
+    def test_regular_render_by_default(self):
+        """Без параметра stream лента рендерится обычным образом."""
+        for url in self.feed_urls():
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertFalse(response.streaming)
+                self.assertIn('page_obj', response.context)
+
+    def test_cards_stream_with_reaction_counts(self):
+        """Счётчики читаются заранее, посты — курсором по одному."""
+        post = Post.objects.first()
+        toggle_reaction(self.author, post.pk, Reaction.LOVE)
+        paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+        posts = _page_posts(paginator, 1, self.author)
+        with self.assertNumQueries(3):
+            first = next(posts)
+        self.assertEqual(first, post)
+        love = {
+            reaction['kind']: reaction
+            for reaction in first.reaction_counts
+        }[Reaction.LOVE]
+        self.assertEqual(love['count'], 1)
+        self.assertTrue(love['mine'])
+        self.assertEqual(len(list(posts)), 9)
+
+    def test_streamed_cards_have_user_reactions(self):
+        """Потоковые карточки рендерятся с request: формы и своя отметка."""
+        reader = User.objects.get(username='reader')
+        toggle_reaction(reader, Post.objects.first().pk, Reaction.LIKE)
+        response = self.authorized_client.get(
+            reverse('posts:index'), {'stream': 1}
+        )
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(
+            content.count('method="post"'), 10 * len(Reaction.KINDS)
+        )
+        self.assertEqual(content.count('btn-sm btn-primary'), 1)
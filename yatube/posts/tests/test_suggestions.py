@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.models import Task
+from core.tasks import run_tasks
+from posts.models import Follow
+from posts.suggestions import (FollowGraph, follow_suggestions,
+                               rebuild_suggestions)
+
+User = get_user_model()
+
+
+class FollowGraphTests(TestCase):
+    def test_friends_of_friends(self):
+        graph = FollowGraph([(1, 2), (1, 3), (2, 4), (3, 4), (3, 5), (2, 1)])
+        nodes = {user_id: node for node, user_id in enumerate(graph.ids)}
+        suggestions = [
+            (graph.ids[node], mutual)
+            for node, mutual in graph.friends_of_friends(nodes[1])
+        ]
+        self.assertEqual(suggestions, [(4, 2), (5, 1)])
+        self.assertEqual(list(graph.suggestions())[-1], (2, 3, 1))
+
+
+class FollowSuggestionsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='reader')
+        cls.friends = [
+            User.objects.create_user(username=f'friend{i}') for i in range(2)
+        ]
+        cls.popular = User.objects.create_user(username='popular')
+        cls.niche = User.objects.create_user(username='niche')
+        for friend in cls.friends:
+            Follow.objects.create(user=cls.reader, author=friend)
+            Follow.objects.create(user=friend, author=cls.popular)
+        Follow.objects.create(user=cls.friends[0], author=cls.niche)
+        Follow.objects.create(user=cls.friends[0], author=cls.reader)
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def suggested(self, user):
+        return [
+            (suggestion.author, suggestion.mutual)
+            for suggestion in follow_suggestions(user)
+        ]
+
+    def test_rebuild(self):
+        call_command('rebuild_suggestions', stdout=StringIO())
+        self.assertEqual(
+            self.suggested(self.reader), [(self.popular, 2), (self.niche, 1)]
+        )
+        self.assertEqual(self.suggested(self.friends[1]), [])
+
+    def test_follow_updates_suggestions(self):
+        rebuild_suggestions()
+        self.client.get(
+            reverse('posts:profile_follow', args=[self.popular.username])
+        )
+        self.assertEqual(Task.objects.get().name,
+                         'posts.tasks.update_follow_suggestions')
+        run_tasks()
+        self.assertEqual(self.suggested(self.reader), [(self.niche, 1)])
+
+    def test_pages_show_suggestions(self):
+        rebuild_suggestions()
+        for url in (
+            reverse('posts:follow_index'),
+            reverse('posts:profile', args=[self.niche.username]),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'Кого почитать')
+                self.assertEqual(
+                    response.context['suggestions'][0].author, self.popular
+                )
+
+    def test_cached_index_has_no_suggestions(self):
+        """Главная кешируется, персональные подсказки в неё не попадают."""
+        rebuild_suggestions()
+        response = self.client.get(reverse('posts:index'))
+        self.assertNotContains(response, 'Кого почитать')
+        self.assertNotIn('suggestions', response.context)
+
+    def test_guest_gets_no_suggestions(self):
+        rebuild_suggestions()
+        response = Client().get(
+            reverse('posts:profile', args=[self.niche.username])
+        )
+        self.assertEqual(response.context['suggestions'], [])
@@ -0,0 +1,70 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Comment, Post, Reaction, TrendingPost
+from posts.reactions import toggle_reaction
+from posts.trending import TRENDING_WINDOW, rank_trending, trending_score
+
+User = get_user_model()
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.quiet = Post.objects.create(author=cls.author, text='Тихий')
+        cls.discussed = Post.objects.create(
+            author=cls.author, text='Обсуждаемый'
+        )
+        cls.viewed = Post.objects.create(
+            author=cls.author, text='Просматриваемый', views=100
+        )
+        cls.old = Post.objects.create(author=cls.author, text='Старый')
+        Post.objects.filter(pk=cls.old.pk).update(
+            created=timezone.now() - TRENDING_WINDOW - timedelta(hours=1)
+        )
+        for i in range(3):
+            Comment.objects.create(
+                post=cls.discussed, author=cls.author, text=f'Ответ {i}'
+            )
+            Comment.objects.create(
+                post=cls.old, author=cls.author, text=f'Ответ {i}'
+            )
+        toggle_reaction(cls.author, cls.discussed.pk, Reaction.LIKE)
+
+    def test_score_decays_with_age(self):
+        self.assertGreater(trending_score(1, 0, 0, 1),
+                           trending_score(1, 0, 0, 24))
+        self.assertEqual(trending_score(0, 0, 0, 1), 0)
+
+    def test_ranking(self):
+        """Активные свежие посты по местам, тихие и старые — мимо."""
+        self.assertEqual(rank_trending(), 2)
+        self.assertEqual(
+            list(TrendingPost.objects.values_list('post_id', flat=True)),
+            [self.discussed.pk, self.viewed.pk]
+        )
+        self.assertEqual(rank_trending(size=1), 1)
+        self.assertEqual(TrendingPost.objects.get().post, self.discussed)
+
+    def test_page_reads_ranked_table(self):
+        rank_trending()
+        with self.assertNumQueries(2):
+            # посты по местам с авторами и реакции на них
+            response = Client().get(reverse('posts:trending'))
+        self.assertEqual(
+            [post.text for post in response.context['posts']],
+            ['Обсуждаемый', 'Просматриваемый']
+        )
+
+    def test_command(self):
+        out = StringIO()
+        call_command('rank_trending', stdout=out)
+        self.assertIn('Популярное: 2 постов', out.getvalue())
@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.warmup import template_names
+from posts.models import Group, Post
+from posts.warmup import hot_page_urls, warm_up
+
+User = get_user_model()
+
+
+class WarmupTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.quiet = User.objects.create_user(username='quiet')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Group.objects.create(
+            title='Пустая группа', slug='empty', description='Пусто'
+        )
+        Post.objects.create(
+            author=cls.author, group=cls.group, text='Тестовый пост'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_hot_pages_skip_empty(self):
+        """Прогреваются только группы и авторы с постами."""
+        self.assertEqual(hot_page_urls(), [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test-slug'}),
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+        ])
+
+    def test_index_served_from_warm_cache(self):
+        """После прогрева главная отдаётся без обращений к базе."""
+        warm_up(host='localhost')
+        with self.assertNumQueries(0):
+            response = Client(HTTP_HOST='localhost').get(
+                reverse('posts:index')
+            )
+        self.assertContains(response, 'Тестовый пост')
+
+    def test_templates_found(self):
+        self.assertIn('posts/index.html', template_names())
+
+    def test_command_prints_timings(self):
+        out = StringIO()
+        call_command('warmup', stdout=out)
+        self.assertIn('/group/test-slug/ [200]', out.getvalue())
+        self.assertIn('всего', out.getvalue())
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import Post, ReactionCounter, TrendingPost
+
+TRENDING_SIZE: int = 50
+TRENDING_WINDOW = timedelta(days=3)
+COMMENT_WEIGHT = 3.0
+REACTION_WEIGHT = 2.0
+VIEW_WEIGHT = 0.1
+# как быстро стареет пост: чем больше, тем сильнее свежесть важнее
+GRAVITY = 1.5
+
+
+def trending_score(comments, reactions, views, age_hours):
+    """Активность вокруг поста, затухающая с его возрастом."""
+    activity = (
+        COMMENT_WEIGHT * comments
+        + REACTION_WEIGHT * reactions
+        + VIEW_WEIGHT * views
+    )
+    return activity / (age_hours + 2) ** GRAVITY
+
+
+def rank_trending(now=None, size=TRENDING_SIZE):
+    """Пересчитывает таблицу популярного; возвращает число мест.
+
+    Агрегаты по комментариям и реакциям считаются только здесь,
+    страница популярного читает готовую таблицу по индексу.
+    """
+    now = now or timezone.now()
+    since = now - TRENDING_WINDOW
+    recent = Post.objects.filter(created__gte=since).annotate(
+        recent_comments=Count(
+            'comments', filter=Q(comments__created__gte=since)
+        )
+    ).values_list('id', 'created', 'views', 'recent_comments').order_by()
+    reactions = dict(
+        ReactionCounter.objects.filter(post__created__gte=since)
+        .values('post_id').annotate(total=Sum('count'))
+        .values_list('post_id', 'total').order_by()
+    )
+    scored = []
+    for post_id, created, views, comments in recent:
+        age_hours = (now - created).total_seconds() / 3600
+        score = trending_score(
+            comments, reactions.get(post_id, 0), views, age_hours
+        )
+        if score > 0:
+            scored.append((score, created, post_id))
+    scored.sort(reverse=True)
+    with transaction.atomic():
+        TrendingPost.objects.all().delete()
+        TrendingPost.objects.bulk_create(
+            TrendingPost(post_id=post_id, rank=rank, score=score)
+            for rank, (score, _, post_id) in enumerate(scored[:size], 1)
+        )
+    return min(len(scored), size)
+
+
+def trending_posts(limit=TRENDING_SIZE):
+    """Посты ленты популярного в порядке мест, одним запросом."""
+    return [
+        trending.post for trending in TrendingPost.objects.select_related(
+            'post__author'
+        )[:limit]
+    ]
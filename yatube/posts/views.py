@@ -1,32 +1,69 @@
-from django.core.paginator import Paginator
+from core.caching import stale_while_revalidate
+from core.counting import EstimatedCountPaginator
+from core.identity import identity_get_or_404
 from django.shortcuts import render, get_object_or_404, redirect
-from .models import Post, Group, User, Follow
+from django.utils.http import is_safe_url
+from .models import Post, Reaction, User, Follow
 from .forms import PostForm, CommentForm
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.cache import cache_page
+from .counters import view_counter
+from .feeds import GLOBAL_FEED, author_feed, feed_paginator, group_feed
+from .reactions import attach_reactions, toggle_reaction
+from .recent import RecentFeedPaginator, recent_entry
+from .related import related_posts
+from .suggestions import follow_suggestions
+from .tasks import (make_post_thumbnail, update_follow_suggestions,
+                    update_related_posts)
+from .trending import trending_posts
+from .groups import get_group_or_404
+from .fragments import render_fragment, wants_fragment
+from .streaming import stream_feed, wants_streaming
 
 num_posts_to_show: int = 10
 
 
-@cache_page(20, key_prefix='index_page')
+@stale_while_revalidate(20, key_prefix='index_page')
 def index(request):
     post_list = Post.objects.select_related('author')
-    paginator = Paginator(post_list, num_posts_to_show)
+    if wants_fragment(request):
+        return render_fragment(request, post_list, {}, 'index',
+                               num_posts_to_show)
+    if wants_streaming(request):
+        paginator = EstimatedCountPaginator(post_list, num_posts_to_show)
+        return stream_feed(request, 'posts/stream/index_top.html',
+                           paginator, {})
+    paginator = feed_paginator(GLOBAL_FEED, post_list, num_posts_to_show)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    page_obj.object_list = attach_reactions(page_obj, request.user)
     context = {
         'page_obj': page_obj,
     }
     return render(request, 'posts/index.html', context)
 
 
+def trending(request):
+    posts = attach_reactions(trending_posts(), request.user)
+    return render(request, 'posts/trending.html', {'posts': posts})
+
+
 def group_posts(request, slug):
     template = 'posts/group_list.html'
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.group.select_related('group')
-    paginator = Paginator(posts, num_posts_to_show)
+    group = get_group_or_404(slug)
+    posts = group.group.select_related('author')
+    if wants_fragment(request):
+        return render_fragment(request, posts, {'group': group},
+                               f'group:{group.pk}', num_posts_to_show)
+    if wants_streaming(request):
+        paginator = EstimatedCountPaginator(posts, num_posts_to_show)
+        return stream_feed(request, 'posts/stream/group_list_top.html',
+                           paginator, {'group': group})
+    paginator = RecentFeedPaginator(
+        group_feed(group.pk), posts, num_posts_to_show
+    )
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    page_obj.object_list = attach_reactions(page_obj, request.user)
     context = {
         'group': group,
         'page_obj': page_obj
@@ -35,12 +72,17 @@ def group_posts(request, slug):
 
 
 def profile(request, username):
-    profile = get_object_or_404(User, username=username)
+    if request.user.is_authenticated and request.user.username == username:
+        profile = request.user
+    else:
+        profile = get_object_or_404(User, username=username)
     posts = profile.posts.select_related('author')
-    num_posts = posts.count()
-    paginator = Paginator(posts, num_posts_to_show)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    if wants_streaming(request):
+        paginator = EstimatedCountPaginator(posts, num_posts_to_show)
+    else:
+        paginator = RecentFeedPaginator(
+            author_feed(profile.pk), posts, num_posts_to_show
+        )
     following = False
     guest = True
     if request.user.is_authenticated:
@@ -51,27 +93,41 @@ def profile(request, username):
         guest = False
     context = {
         'author': profile,
-        'page_obj': page_obj,
-        'num_posts': num_posts,
+        'num_posts': paginator.count,
         'following': following,
         'guest': guest,
+        'suggestions': follow_suggestions(request.user),
     }
+    if wants_streaming(request):
+        return stream_feed(request, 'posts/stream/profile_top.html',
+                           paginator, context)
+    page_number = request.GET.get('page')
+    context['page_obj'] = paginator.get_page(page_number)
+    context['page_obj'].object_list = attach_reactions(
+        context['page_obj'], request.user
+    )
     return render(request, 'posts/profile.html', context)
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = identity_get_or_404(Post, post_id)
+    view_counter.add(post.pk)
+    attach_reactions([post], request.user)
     comments = post.comments.select_related('post')
     show_first_signs = 30
     title = post.text[:show_first_signs]
     author = post.author
-    num_posts = author.posts.select_related().count()
+    num_posts = recent_entry(
+        author_feed(author.pk), author.posts.all()
+    )['total']
     form = CommentForm(request.POST)
     context = {
         'post': post,
         'title': title,
         'author': author,
         'num_posts': num_posts,
+        'views': post.views + view_counter.pending(post.pk),
+        'related': related_posts(post.pk),
         'comments': comments,
         'form': form
     }
@@ -90,6 +146,9 @@ def post_create(request):
             post = form.save(commit=False)
             post.author = request.user
             post.save()
+            update_related_posts.delay(post_id=post.pk)
+            if post.image:
+                make_post_thumbnail.delay(post_id=post.pk)
             return redirect('posts:profile', username=request.user.username)
         return render(request, template, {'form': form})
     form = PostForm()
@@ -99,7 +158,7 @@ def post_create(request):
 @login_required
 def post_edit(request, pk):
     template = 'posts/create_post.html'
-    post = Post.objects.get(pk=pk)
+    post = identity_get_or_404(Post, pk)
     if not post.author.username == request.user.username:
         return redirect('posts:post_detail', post_id=pk)
     form = PostForm(
@@ -108,7 +167,11 @@ def post_edit(request, pk):
         instance=post
     )
     if form.is_valid():
-        form.save()
+        post = form.save()
+        if 'text' in form.changed_data:
+            update_related_posts.delay(post_id=post.pk)
+        if 'image' in form.changed_data and post.image:
+            make_post_thumbnail.delay(post_id=post.pk)
         return redirect('posts:post_detail', post_id=pk)
     form = PostForm(instance=post)
     return render(request, template, {'form': form, 'is_edit': True})
@@ -116,7 +179,7 @@ def post_edit(request, pk):
 
 @login_required
 def add_comment(request, post_id):
-    post = Post.objects.get(pk=post_id)
+    post = identity_get_or_404(Post, post_id)
     form = CommentForm(request.POST or None)
     if form.is_valid():
         comment = form.save(commit=False)
@@ -129,13 +192,19 @@ def add_comment(request, post_id):
 @login_required
 def follow_index(request):
     posts = Post.objects.filter(author__following__user=request.user)
-    paginator = Paginator(posts, num_posts_to_show)
+    if wants_fragment(request):
+        return render_fragment(request, posts, {},
+                               f'follow:{request.user.pk}',
+                               num_posts_to_show, private=True)
+    paginator = EstimatedCountPaginator(posts, num_posts_to_show)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    page_obj.object_list = attach_reactions(page_obj, request.user)
     context = {
         'page_obj': page_obj,
+        'suggestions': follow_suggestions(request.user),
     }
-    return render(request, 'posts/index.html', context)
+    return render(request, 'posts/follow.html', context)
 
 
 @login_required
@@ -146,6 +215,7 @@ def profile_follow(request, username):
             user=request.user,
             author=author
         )
+        update_follow_suggestions.delay(user_id=request.user.pk)
         return redirect('posts:follow_index')
     return redirect('posts:follow_index')
 
@@ -154,4 +224,17 @@ def profile_follow(request, username):
 def profile_unfollow(request, username):
     follow = Follow.objects.filter(author=User.objects.get(username=username))
     follow.delete()
+    update_follow_suggestions.delay(user_id=request.user.pk)
     return redirect('posts:follow_index')
+
+
+@login_required
+def post_react(request, post_id, kind):
+    if request.method == 'POST' and kind in dict(Reaction.KINDS):
+        post = identity_get_or_404(Post, post_id)
+        toggle_reaction(request.user, post.pk, kind)
+    next_url = request.POST.get('next')
+    if next_url and is_safe_url(next_url, allowed_hosts={request.get_host()},
+                                require_https=request.is_secure()):
+        return redirect(next_url)
+    return redirect('posts:post_detail', post_id=post_id)
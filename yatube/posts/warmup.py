@@ -0,0 +1,46 @@
+from django.db.models import Count
+from django.urls import reverse
+
+from core.warmup import compile_templates, prerender, prime_urls, timed
+
+from .models import Group, User
+
+HOT_GROUPS: int = 3
+HOT_AUTHORS: int = 3
+
+
+def hot_page_urls(groups=HOT_GROUPS, authors=HOT_AUTHORS):
+    """Главная и первые страницы самых наполненных групп и авторов."""
+    urls = [reverse('posts:index')]
+    busiest_groups = Group.objects.annotate(
+        num_posts=Count('group')
+    ).filter(num_posts__gt=0).order_by('-num_posts')[:groups]
+    urls += [
+        reverse('posts:group_list', kwargs={'slug': group.slug})
+        for group in busiest_groups
+    ]
+    busiest_authors = User.objects.annotate(
+        num_posts=Count('posts')
+    ).filter(num_posts__gt=0).order_by('-num_posts')[:authors]
+    urls += [
+        reverse('posts:profile', kwargs={'username': author.username})
+        for author in busiest_authors
+    ]
+    return urls
+
+
+def warm_up(host=None, groups=HOT_GROUPS, authors=HOT_AUTHORS):
+    """Прогревает шаблоны, URL и кеши страниц; возвращает отчёт.
+
+    Отчёт — список строк (что сделано, время в секундах).
+    """
+    report = []
+    compiled, seconds = timed(compile_templates)
+    report.append((f'шаблоны: {compiled}', seconds))
+    patterns, seconds = timed(prime_urls)
+    report.append((f'резолвер URL: {patterns}', seconds))
+    urls, seconds = timed(hot_page_urls, groups, authors)
+    report.append((f'выбор страниц: {len(urls)}', seconds))
+    for url, status, seconds in prerender(urls, host):
+        report.append((f'{url} [{status}]', seconds))
+    return report
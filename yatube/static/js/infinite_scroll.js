@@ -0,0 +1,42 @@
+(function () {
+  'use strict';
+
+  var feed = document.querySelector('article[data-fragment-url]');
+  if (!feed || !window.fetch || !('IntersectionObserver' in window)) {
+    return;
+  }
+  var url = feed.dataset.fragmentUrl;
+  var pagination = document.querySelector('nav[aria-label="Page navigation"]');
+  if (pagination) {
+    pagination.remove();
+  }
+  var sentinel = document.createElement('div');
+  feed.parentNode.insertBefore(sentinel, feed.nextSibling);
+  var loading = false;
+
+  var observer = new IntersectionObserver(function (entries) {
+    if (!entries[0].isIntersecting || loading || !url) {
+      return;
+    }
+    loading = true;
+    fetch(url, {credentials: 'same-origin'})
+      .then(function (response) {
+        return response.json();
+      })
+      .then(function (data) {
+        feed.insertAdjacentHTML('beforeend', '<hr>' + data.html);
+        url = data.next
+          ? '?fragment=1&cursor=' + encodeURIComponent(data.next)
+          : null;
+        if (!url) {
+          observer.disconnect();
+        }
+        loading = false;
+      })
+      .catch(function () {
+        loading = false;
+      });
+  }, {rootMargin: '600px'});
+
+  observer.observe(sentinel);
+})();
@@ -1,5 +1,8 @@
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import PasswordResetForm, UserCreationForm
 from django.contrib.auth import get_user_model
+from django.contrib.sites.shortcuts import get_current_site
+
+from .tasks import send_password_reset
 
 
 User = get_user_model()
@@ -9,3 +12,28 @@ class CreationForm(UserCreationForm):
     class Meta(UserCreationForm.Meta):
         model = User
         fields = ('first_name', 'last_name', 'username', 'email')
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """Сброс пароля без поиска пользователя и отправки письма в запросе.
+
+    Запрос только ставит задачу, поэтому время ответа не зависит
+    ни от почтового сервера, ни от того, есть ли такой адрес в базе.
+    """
+
+    def save(self, domain_override=None,
+             subject_template_name='registration/password_reset_subject.txt',
+             email_template_name='registration/password_reset_email.html',
+             use_https=False, token_generator=None, from_email=None,
+             request=None, html_email_template_name=None,
+             extra_email_context=None):
+        domain = domain_override or get_current_site(request).domain
+        send_password_reset.delay(
+            email=self.cleaned_data['email'],
+            domain=domain,
+            use_https=use_https,
+            subject_template_name=subject_template_name,
+            email_template_name=email_template_name,
+            html_email_template_name=html_email_template_name,
+            from_email=from_email,
+        )
@@ -0,0 +1,21 @@
+from django.contrib.auth.forms import PasswordResetForm
+
+from core.tasks import task
+
+
+@task()
+def send_password_reset(email, domain, use_https, subject_template_name,
+                        email_template_name, html_email_template_name=None,
+                        from_email=None):
+    """Ищет пользователей по адресу и отправляет им ссылку сброса."""
+    form = PasswordResetForm({'email': email})
+    if not form.is_valid():
+        return
+    form.save(
+        domain_override=domain,
+        use_https=use_https,
+        subject_template_name=subject_template_name,
+        email_template_name=email_template_name,
+        html_email_template_name=html_email_template_name,
+        from_email=from_email,
+    )
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Task
+from core.tasks import run_tasks
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    QUEUED_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class PasswordResetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        User.objects.create_user(
+            username='auth', email='auth@example.com', password='pass'
+        )
+
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse('users:pass_reset')
+
+    def test_reset_mail_sent_by_worker(self):
+        """Запрос только ставит задачу, письмо отправляет обработчик."""
+        response = self.client.post(self.url, {'email': 'auth@example.com'})
+        self.assertRedirects(response, reverse('users:pass_reset_done'))
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(Task.objects.get().name,
+                         'users.tasks.send_password_reset')
+        while run_tasks():
+            pass
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['auth@example.com'])
+        self.assertIn('testserver', mail.outbox[0].body)
+
+    def test_same_work_for_unknown_email(self):
+        """Известный и неизвестный адрес обрабатываются одинаково."""
+        for email in ('auth@example.com', 'nobody@example.com'):
+            with self.assertNumQueries(1):
+                self.client.post(self.url, {'email': email})
+        while run_tasks():
+            pass
+        self.assertEqual(len(mail.outbox), 1)
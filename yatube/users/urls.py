@@ -9,6 +9,7 @@ from django.contrib.auth.views import (LoginView,
 from django.urls import path
 
 from . import views
+from .forms import QueuedPasswordResetForm
 
 
 app_name = 'users'
@@ -35,7 +36,8 @@ urlpatterns = [
          name='pass_change_done'),
     path('password_reset/',
          PasswordResetView
-         .as_view(template_name='users/password_reset_form.html'),
+         .as_view(template_name='users/password_reset_form.html',
+                  form_class=QueuedPasswordResetForm),
          name='pass_reset'),
     path('password_reset/done/',
          PasswordResetDoneView
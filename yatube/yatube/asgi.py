@@ -0,0 +1,25 @@
+"""
+ASGI config for yatube project.
+
+Django 2.2 has no native ASGI handler, so the WSGI application is wrapped
+in core.asgi.PooledWsgiToAsgi. An ASGI server (uvicorn, daphne) then owns
+client sockets: views run in a thread pool, and response chunks are handed
+to the event loop, so a slow client does not hold a worker thread.
+"""
+
+import os
+
+# см. yatube/wsgi.py
+os.environ.setdefault('SETUPTOOLS_USE_DISTUTILS', 'stdlib')
+
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+
+from core.asgi import PooledWsgiToAsgi  # noqa: E402
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+application = PooledWsgiToAsgi(get_wsgi_application())
+
+from posts.counters import view_counter  # noqa: E402
+
+view_counter.start()
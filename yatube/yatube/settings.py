@@ -16,7 +16,11 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 SECRET_KEY = '7tx9yynsh=!czqxyc$_%qc48r5s6l@5unbbigbs0s#9=h$zr!^'
 
-DEBUG = False
+# Профиль настроек: production (по умолчанию) или development.
+# Отладочные приложения и middleware подключаются только в development.
+SETTINGS_PROFILE = os.getenv('YATUBE_SETTINGS_PROFILE', 'production')
+
+DEBUG = SETTINGS_PROFILE == 'development'
 
 
 
@@ -33,6 +37,7 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
     'about.apps.AboutConfig',
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -40,20 +45,24 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'sorl.thumbnail',
-    'debug_toolbar',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.Fast404Middleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.identity.IdentityMapMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+if SETTINGS_PROFILE == 'development':
+    INSTALLED_APPS += ['debug_toolbar']
+    MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
+
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
@@ -116,11 +125,22 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
 
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+SERVE_STATIC = True
+
 LOGIN_URL = 'users:login'
 
 LOGIN_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма уходят в очередь задач; runworker отправляет их пачками
+# бэкендом QUEUED_EMAIL_BACKEND (локально — в файлы EMAIL_FILE_PATH,
+# в продакшене — django.core.mail.backends.smtp.EmailBackend).
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+
+QUEUED_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
@@ -129,6 +149,30 @@ CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+SERVE_MEDIA = True
+
+# None, 'x-accel' (nginx) или 'x-sendfile' (apache, lighttpd)
+MEDIA_OFFLOAD = None
+
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+STREAMING_FEEDS = False
+
+EXACT_COUNT_THRESHOLD = 10000
+
+COUNT_CACHE_TIMEOUT = 60
+
+# Прогрев кешей при старте WSGI-процесса (см. manage.py warmup):
+# LocMemCache у каждого воркера свой, поэтому прогревать нужно в нём.
+WARMUP_ON_START = False
+WARMUP_HOST = 'localhost'
+
+# Отложенные задачи выполняет manage.py runworker; True — сразу в запросе.
+TASKS_EAGER = False
+
+# Как часто (в секундах) процесс записывает накопленные просмотры постов.
+VIEW_COUNTER_FLUSH_INTERVAL = 5
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
@@ -9,8 +9,22 @@ https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 
 import os
 
-from django.core.wsgi import get_wsgi_application
+# Django 2.2 импортирует distutils при старте; shim из setuptools тянет
+# за собой pkg_resources и добавляет к холодному старту около 150 мс.
+os.environ.setdefault('SETUPTOOLS_USE_DISTUTILS', 'stdlib')
+
+from django.core.wsgi import get_wsgi_application  # noqa: E402
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+from posts.counters import view_counter  # noqa: E402
+
+view_counter.start()
+
+if settings.WARMUP_ON_START:
+    from posts.warmup import warm_up  # noqa: E402
+    warm_up()